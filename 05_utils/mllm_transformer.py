@@ -22,7 +22,7 @@ import torch
 import re
 import json
 from enum import Enum
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 class ThreatCategory(str, Enum):
     """Classification categories for phishing detection."""
@@ -48,6 +48,10 @@ class MLLMFeatureTransformer:
             model_name: HuggingFace model identifier (default: Qwen2.5-3B-Instruct)
         """
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        # Decoder-only models need left padding for batched generation
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
         
         # 4-bit quantization configuration for 4GB VRAM optimization
         quantization_config = BitsAndBytesConfig(
@@ -81,6 +85,7 @@ class MLLMFeatureTransformer:
                 r'(?i)(click\s+(?:the\s+)?(?:link|button)\s+(?:below|here)\s+to\s+(?:verify|confirm|secure))',
             ]
         }
+        self._compiled_ai_patterns = [re.compile(p) for p in self.ai_indicators['patterns']]
     
     def transform_to_text(self, metadata: Dict[str, Any]) -> str:
         """
@@ -92,31 +97,43 @@ class MLLMFeatureTransformer:
         Returns:
             str: Generated textual description of the website's suspicion level.
         """
-        prompt = self._create_prompt(metadata)
-        messages = [
-            {"role": "system", "content": self._get_system_prompt()},
-            {"role": "user", "content": prompt}
-        ]
+        return self.transform_to_text_batch([metadata])[0]
+    
+    def transform_to_text_batch(self, metadata_list: List[Dict[str, Any]]) -> List[str]:
+        """
+        Transform several metadata dicts into text descriptions in one forward pass.
         
-        text = self.tokenizer.apply_chat_template(
-            messages,
-            tokenize=False,
-            add_generation_prompt=True
-        )
+        Args:
+            metadata_list: List of metadata dictionaries (see transform_to_text)
+            
+        Returns:
+            List[str]: Generated descriptions, in the same order as the input.
+        """
+        texts = []
+        for metadata in metadata_list:
+            messages = [
+                {"role": "system", "content": self._get_system_prompt()},
+                {"role": "user", "content": self._create_prompt(metadata)}
+            ]
+            texts.append(self.tokenizer.apply_chat_template(
+                messages,
+                tokenize=False,
+                add_generation_prompt=True
+            ))
         
-        model_inputs = self.tokenizer([text], return_tensors="pt").to(self.model.device)
+        model_inputs = self.tokenizer(texts, return_tensors="pt", padding=True).to(self.model.device)
         
         generated_ids = self.model.generate(
             **model_inputs,
-            max_new_tokens=512
+            max_new_tokens=512,
+            pad_token_id=self.tokenizer.pad_token_id
         )
         
-        generated_ids = [
-            output_ids[len(input_ids):] for input_ids, output_ids in zip(model_inputs.input_ids, generated_ids)
-        ]
+        # Inputs are left-padded to a common length, so new tokens start there
+        prompt_length = model_inputs.input_ids.shape[1]
+        generated_ids = [output_ids[prompt_length:] for output_ids in generated_ids]
         
-        response = self.tokenizer.batch_decode(generated_ids, skip_special_tokens=True)[0]
-        return response
+        return self.tokenizer.batch_decode(generated_ids, skip_special_tokens=True)
     
     def classify_threat(self, metadata: Dict[str, Any], toolkit_signatures: Optional[Dict] = None) -> Tuple[ThreatCategory, float, str]:
         """
@@ -211,9 +228,9 @@ class MLLMFeatureTransformer:
                 score += 0.1
         
         # Check for phishing patterns (often in AI-generated phishing)
-        for pattern in self.ai_indicators['patterns']:
-            if re.search(pattern, content):
-                match = re.search(pattern, content)
+        for pattern in self._compiled_ai_patterns:
+            match = pattern.search(content)
+            if match:
                 detected_indicators.append(f"Suspicious pattern: '{match.group()[:50]}...'")
                 score += 0.15
         
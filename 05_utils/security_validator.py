@@ -13,11 +13,52 @@ Version: 2.0.0
 """
 
 import re
+import socket
+import time
 import ipaddress
-from urllib.parse import urlparse, urlencode, parse_qs, urlunparse, quote, unquote
+from urllib.parse import urlparse, urlencode, parse_qs, urlunparse, quote, unquote, ParseResult
 from typing import Dict, List, Set, Optional, Tuple
 
 
+# Cache for hostname resolution used by the SSRF check
+# Maps hostname -> (resolved IP strings, time of lookup)
+_dns_cache: Dict[str, Tuple[Tuple[str, ...], float]] = {}
+DNS_CACHE_TTL = 300  # Seconds before a hostname is resolved again
+DNS_CACHE_MAX_ENTRIES = 4096
+
+
+def _resolve_host(hostname: str) -> Tuple[str, ...]:
+    """
+    Resolve hostname to its IP addresses, caching results for DNS_CACHE_TTL.
+    
+    Args:
+        hostname: Hostname to resolve
+        
+    Returns:
+        Tuple of IP address strings (empty if resolution failed)
+    """
+    now = time.monotonic()
+    cached = _dns_cache.get(hostname)
+    if cached is not None and now - cached[1] < DNS_CACHE_TTL:
+        return cached[0]
+    
+    try:
+        infos = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+    except (socket.error, UnicodeError):
+        addresses = ()
+    
+    if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+        _dns_cache.clear()
+    _dns_cache[hostname] = (addresses, now)
+    return addresses
+
+
+def clear_dns_cache():
+    """Clear the hostname resolution cache to force fresh lookups."""
+    _dns_cache.clear()
+
+
 class URLSecurityValidator:
     """
     Validates URLs for security issues before processing.
@@ -40,19 +81,6 @@ class URLSecurityValidator:
     # Allowed schemes (whitelist approach)
     ALLOWED_SCHEMES: Set[str] = {'http', 'https'}
     
-    # Blocked IP ranges for SSRF protection
-    BLOCKED_IP_NETWORKS: List[ipaddress.IPv4Network] = [
-        ipaddress.ip_network('10.0.0.0/8'),      # Private
-        ipaddress.ip_network('172.16.0.0/12'),   # Private
-        ipaddress.ip_network('192.168.0.0/16'),  # Private
-        ipaddress.ip_network('127.0.0.0/8'),     # Loopback
-        ipaddress.ip_network('169.254.0.0/16'),  # Link-local
-        ipaddress.ip_network('0.0.0.0/8'),       # Current network
-        ipaddress.ip_network('::1/128'),         # IPv6 loopback
-        ipaddress.ip_network('fc00::/7'),        # IPv6 private
-        ipaddress.ip_network('fe80::/10'),       # IPv6 link-local
-    ]
-    
     # Blocked ports (common services that shouldn't be accessed)
     BLOCKED_PORTS: Set[int] = {
         22,    # SSH
@@ -75,6 +103,11 @@ class URLSecurityValidator:
         '<', '>', '"', "'", '`', '{', '}', '|', '\\', '^', '\x00', '\x01'
     }
     
+    # Single character class matching any of DANGEROUS_CHARS (one regex pass)
+    _DANGEROUS_RE: re.Pattern = re.compile(
+        '[' + re.escape(''.join(sorted(DANGEROUS_CHARS))) + ']'
+    )
+    
     # URL length limits
     MAX_URL_LENGTH: int = 2048
     MAX_DOMAIN_LENGTH: int = 253
@@ -89,8 +122,14 @@ class URLSecurityValidator:
         re.compile(r'\s'),                  # Whitespace
     ]
     
-    def __init__(self):
-        self.validation_errors: List[str] = []
+    # Stateless: errors are collected per call, so one instance can be shared
+    __slots__ = ()
+    
+    # All SUSPICIOUS_PATTERNS fused into one alternation; group pN is pattern N
+    _SUSPICIOUS_RE: re.Pattern = re.compile(
+        '|'.join(f'(?P<p{i}>{p.pattern})' for i, p in enumerate(SUSPICIOUS_PATTERNS)),
+        re.I
+    )
     
     def validate(self, url: str, strict: bool = True) -> Tuple[bool, List[str]]:
         """
@@ -109,103 +148,141 @@ class URLSecurityValidator:
             if not is_valid:
                 print(f"URL rejected: {errors}")
         """
-        self.validation_errors = []
+        errors: List[str] = []
+        
+        parsed = self._parse(url, errors)
+        if parsed is None:
+            return False, errors
+        
+        return self._validate_parsed(url, parsed, strict, errors)
+    
+    def validate_and_canonicalize(self, url: str, strict: bool = True) -> Tuple[bool, List[str], str]:
+        """
+        Validate and canonicalize a URL, parsing it only once.
+        
+        Args:
+            url: URL to validate
+            strict: If True, reject any suspicious URLs. If False, warn but allow.
+            
+        Returns:
+            Tuple of (is_valid, list_of_errors, canonical_url)
+        """
+        errors: List[str] = []
         
+        parsed = self._parse(url, errors)
+        if parsed is None:
+            return False, errors, url
+        
+        is_valid, errors = self._validate_parsed(url, parsed, strict, errors)
+        return is_valid, errors, self.canonicalize(url, parsed)
+    
+    def _parse(self, url: str, errors: List[str]) -> Optional[ParseResult]:
+        """
+        Run the pre-parse checks (steps 1-3) and parse the URL.
+        
+        Args:
+            url: URL to parse
+            errors: List that rejection reasons are appended to
+            
+        Returns:
+            ParseResult, or None if the URL was rejected (errors recorded)
+        """
         # 1. Basic checks
         if not url or not isinstance(url, str):
-            self.validation_errors.append("URL must be a non-empty string")
-            return False, self.validation_errors
+            errors.append("URL must be a non-empty string")
+            return None
         
         # 2. Length check
         if len(url) > self.MAX_URL_LENGTH:
-            self.validation_errors.append(f"URL too long: {len(url)} > {self.MAX_URL_LENGTH}")
-            return False, self.validation_errors
+            errors.append(f"URL too long: {len(url)} > {self.MAX_URL_LENGTH}")
+            return None
         
         # 3. Parse URL
         try:
-            parsed = urlparse(url)
+            return urlparse(url)
         except Exception as e:
-            self.validation_errors.append(f"Failed to parse URL: {e}")
-            return False, self.validation_errors
-        
+            errors.append(f"Failed to parse URL: {e}")
+            return None
+    
+    def _validate_parsed(self, url: str, parsed: ParseResult, strict: bool,
+                         errors: List[str]) -> Tuple[bool, List[str]]:
+        """Run validation steps 4-12 on an already parsed URL."""
         # 4. Scheme validation
         scheme = parsed.scheme.lower()
         if not scheme:
-            self.validation_errors.append("URL must include scheme (http:// or https://)")
-            return False, self.validation_errors
+            errors.append("URL must include scheme (http:// or https://)")
+            return False, errors
         
         if scheme in self.BLOCKED_SCHEMES:
-            self.validation_errors.append(f"Scheme '{scheme}' is not allowed")
-            return False, self.validation_errors
+            errors.append(f"Scheme '{scheme}' is not allowed")
+            return False, errors
         
         if scheme not in self.ALLOWED_SCHEMES:
-            self.validation_errors.append(f"Scheme '{scheme}' is not in allowed list: {self.ALLOWED_SCHEMES}")
+            errors.append(f"Scheme '{scheme}' is not in allowed list: {self.ALLOWED_SCHEMES}")
             if strict:
-                return False, self.validation_errors
+                return False, errors
         
         # 5. Host validation
         hostname = parsed.hostname
         if not hostname:
-            self.validation_errors.append("URL must have a hostname")
-            return False, self.validation_errors
+            errors.append("URL must have a hostname")
+            return False, errors
         
         # 6. Domain length
         if len(hostname) > self.MAX_DOMAIN_LENGTH:
-            self.validation_errors.append(f"Domain name too long: {len(hostname)} > {self.MAX_DOMAIN_LENGTH}")
-            return False, self.validation_errors
+            errors.append(f"Domain name too long: {len(hostname)} > {self.MAX_DOMAIN_LENGTH}")
+            return False, errors
         
         # 7. Check for dangerous characters
-        for char in self.DANGEROUS_CHARS:
-            if char in url:
-                self.validation_errors.append(f"Dangerous character found in URL: {repr(char)}")
-                if strict:
-                    return False, self.validation_errors
-        
-        # 8. Check for suspicious patterns
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            if pattern.search(url):
-                self.validation_errors.append(f"Suspicious pattern found: {pattern.pattern}")
-                if strict:
-                    return False, self.validation_errors
+        for char in dict.fromkeys(self._DANGEROUS_RE.findall(url)):
+            errors.append(f"Dangerous character found in URL: {repr(char)}")
+            if strict:
+                return False, errors
+        
+        # 8. Check for suspicious patterns (single scan over the URL)
+        seen_patterns = set()
+        for match in self._SUSPICIOUS_RE.finditer(url):
+            index = int(match.lastgroup[1:])
+            if index in seen_patterns:
+                continue
+            seen_patterns.add(index)
+            errors.append(
+                f"Suspicious pattern found: {self.SUSPICIOUS_PATTERNS[index].pattern}"
+            )
+            if strict:
+                return False, errors
         
         # 9. SSRF Protection - Check if hostname resolves to private IP
         if self._is_private_host(hostname):
-            self.validation_errors.append("URL resolves to private/internal IP address (SSRF protection)")
-            return False, self.validation_errors
+            errors.append("URL resolves to private/internal IP address (SSRF protection)")
+            return False, errors
         
         # 10. Port validation
         port = parsed.port
         if port and port in self.BLOCKED_PORTS:
-            self.validation_errors.append(f"Port {port} is blocked")
-            return False, self.validation_errors
+            errors.append(f"Port {port} is blocked")
+            return False, errors
         
         # 11. Path validation
         if parsed.path:
             decoded_path = unquote(parsed.path)
             if len(decoded_path) > self.MAX_PATH_LENGTH:
-                self.validation_errors.append(f"Path too long: {len(decoded_path)} > {self.MAX_PATH_LENGTH}")
-                return False, self.validation_errors
+                errors.append(f"Path too long: {len(decoded_path)} > {self.MAX_PATH_LENGTH}")
+                return False, errors
             
             # Check for path traversal
             if '..' in decoded_path:
-                self.validation_errors.append("Path traversal attempt detected")
-                return False, self.validation_errors
+                errors.append("Path traversal attempt detected")
+                return False, errors
         
-        # 12. Query parameter validation
-        if parsed.query:
-            try:
-                params = parse_qs(parsed.query)
-                # Check for suspicious parameter names/values
-                for key, values in params.items():
-                    for value in values:
-                        if any(char in key or char in value for char in self.DANGEROUS_CHARS):
-                            self.validation_errors.append(f"Suspicious characters in query parameter: {key}")
-                            if strict:
-                                return False, self.validation_errors
-            except Exception:
-                pass  # Invalid query string format, but we'll allow it
-        
-        return len(self.validation_errors) == 0, self.validation_errors
+        # 12. Query validation - raw characters were already scanned in step 7,
+        # so only percent-encoded ones remain to be checked
+        if '%' in parsed.query and self._DANGEROUS_RE.search(unquote(parsed.query)):
+            errors.append("Suspicious encoded characters in query string")
+            if strict:
+                return False, errors
+        
+        return len(errors) == 0, errors
     
     def _is_private_host(self, hostname: str) -> bool:
         """
@@ -220,31 +297,31 @@ class URLSecurityValidator:
         try:
             # Check if it's already an IP address
             ip = ipaddress.ip_address(hostname)
-            # Check against blocked networks
-            for network in self.BLOCKED_IP_NETWORKS:
-                if ip in network:
-                    return True
-            return False
+            return self._is_blocked_ip(ip)
         except ValueError:
             # Not an IP, try DNS resolution
             pass
         
-        # Try to resolve hostname
-        try:
-            import socket
-            ip_str = socket.gethostbyname(hostname)
-            ip = ipaddress.ip_address(ip_str)
+        # Resolve hostname (cached); can't resolve - allow it
+        for ip_str in _resolve_host(hostname):
+            try:
+                # Strip IPv6 zone index (e.g. fe80::1%eth0)
+                ip = ipaddress.ip_address(ip_str.split('%', 1)[0])
+            except ValueError:
+                continue
             
-            for network in self.BLOCKED_IP_NETWORKS:
-                if ip in network:
-                    return True
-        except Exception:
-            # Can't resolve or other error - allow it
-            pass
+            if self._is_blocked_ip(ip):
+                return True
         
         return False
     
-    def canonicalize(self, url: str) -> str:
+    @staticmethod
+    def _is_blocked_ip(ip) -> bool:
+        """Check if an IP address is private, loopback, link-local or reserved."""
+        return (ip.is_private or ip.is_loopback or ip.is_link_local
+                or ip.is_unspecified or ip.is_reserved or ip.is_multicast)
+    
+    def canonicalize(self, url: str, parsed: Optional[ParseResult] = None) -> str:
         """
         Canonicalize URL to prevent bypass attacks.
         
@@ -256,12 +333,14 @@ class URLSecurityValidator:
         
         Args:
             url: URL to canonicalize
+            parsed: Optional result of urlparse(url), to avoid re-parsing
             
         Returns:
             str: Canonicalized URL
         """
         try:
-            parsed = urlparse(url)
+            if parsed is None:
+                parsed = urlparse(url)
             
             # Lowercase scheme and netloc
             scheme = parsed.scheme.lower()
@@ -318,23 +397,32 @@ class URLSecurityValidator:
         return is_valid
 
 
-def validate_url_for_analysis(url: str) -> Tuple[bool, str]:
+# Shared validator instance (stateless, safe to reuse across threads)
+_VALIDATOR = URLSecurityValidator()
+
+
+def validate_url_for_analysis(url: str, canonicalize: bool = False) -> tuple:
     """
     Convenience function for API endpoint validation.
     
     Args:
         url: URL to validate
+        canonicalize: Also return the canonical URL, built from the same
+            parse as the validation (validate_and_canonicalize)
         
     Returns:
-        Tuple of (is_valid, error_message)
+        Tuple of (is_valid, error_message), or (is_valid, error_message,
+        canonical_url) if canonicalize is True
     """
-    validator = URLSecurityValidator()
-    is_valid, errors = validator.validate(url, strict=True)
-    
-    if not is_valid:
-        return False, "; ".join(errors)
+    if canonicalize:
+        is_valid, errors, canonical = _VALIDATOR.validate_and_canonicalize(url, strict=True)
+    else:
+        is_valid, errors = _VALIDATOR.validate(url, strict=True)
     
-    return True, ""
+    error_message = "" if is_valid else "; ".join(errors)
+    if canonicalize:
+        return is_valid, error_message, canonical
+    return is_valid, error_message
 
 
 def demo():
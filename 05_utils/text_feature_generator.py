@@ -1,14 +1,50 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
-from mllm_transformer import MLLMFeatureTransformer
+
+# orjson is optional: serializes straight to bytes in a single buffer
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Dynamic path resolution for standalone operation
 UTILS_DIR = Path(__file__).parent.absolute()
 PROJECT_ROOT = UTILS_DIR.parent
 DEFAULT_DATA_DIR = PROJECT_ROOT / "01_data" / "processed" / "metadata"
 
+
+def _load_metadata(file_path, output_dir):
+    """
+    Load one metadata file in a worker thread.
+
+    Returns (file_path, metadata, output_path). metadata is None if the
+    output for this idx already exists (resumable runs), or the exception
+    if the file could not be read. output_path is reused by the caller
+    when saving the result.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            metadata = json.load(f)
+    except Exception as e:
+        return file_path, e, None
+
+    output_path = output_dir / f"{metadata.get('idx')}_mllm.json"
+    if output_path.exists():
+        return file_path, None, output_path
+    return file_path, metadata, output_path
+
+
+def _write_result(output_path, result):
+    """Save an individual result in a worker thread (one buffered write)."""
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(result))
+    else:
+        output_path.write_text(json.dumps(result))
+
+
 class TextFeatureGenerator:
     def __init__(self, data_dir=None):
         # Use provided path or default to project-relative path
@@ -18,53 +54,115 @@ class TextFeatureGenerator:
             self.data_dir = Path(data_dir)
         self.output_dir = self.data_dir.parent / "mllm_features"
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        
+
+        # Imported here so the module loads without pulling in torch/transformers
+        from mllm_transformer import MLLMFeatureTransformer
+
         print("Loading MLLM (this may take a while)...")
         self.transformer = MLLMFeatureTransformer()
         print("MLLM loaded successfully.")
 
-    def generate_features(self):
+    def generate_features(self, batch_size=16, max_workers=None):
+        """
+        Generate MLLM text features for every metadata file.
+
+        Metadata loading and result writing run in a thread pool (plain file
+        I/O, and forking after the MLLM is on the GPU is unsafe), while the
+        main thread feeds the transformer batches of `batch_size`.
+        """
         files = list(self.data_dir.glob("*.json"))
         print(f"Found {len(files)} metadata files to process.")
-        
+
+        # Skip already generated outputs without opening their metadata.
+        # data_preparation writes metadata as {idx}.json, so the stem is the idx.
+        done = {
+            entry.name[:-len("_mllm.json")]
+            for entry in os.scandir(self.output_dir)
+            if entry.name.endswith("_mllm.json")
+        }
+        before = len(files)
+        files = [f for f in files if f.stem not in done]
+        skipped = before - len(files)
+        if skipped:
+            print(f"Skipping {skipped} already processed files.")
+
+        results = []
+        batch = []
+        writes = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = executor.map(_load_metadata, files, [self.output_dir] * len(files))
+
+            for file_path, metadata, output_path in tqdm(loaded, total=len(files), desc="Generating text features"):
+                if isinstance(metadata, Exception):
+                    print(f"Error processing {file_path}: {metadata}")
+                    continue
+
+                # Skip if already exists (Resumable)
+                if metadata is None:
+                    continue
+
+                batch.append((file_path, metadata, output_path))
+                if len(batch) >= batch_size:
+                    results.extend(self._process_batch(batch, executor, writes))
+                    batch = []
+
+            if batch:
+                results.extend(self._process_batch(batch, executor, writes))
+
+        self._reap_writes(writes, wait=True)
+
+        return results
+
+    def _process_batch(self, batch, executor, writes):
+        """Run one transformer batch and hand the writes to the pool."""
+        try:
+            # Generate text descriptions
+            descriptions = self.transformer.transform_to_text_batch(
+                [metadata for _, metadata, _ in batch]
+            )
+        except Exception:
+            # Retry one by one so a single bad input only loses its own file
+            descriptions = []
+            for file_path, metadata, _ in batch:
+                try:
+                    descriptions.append(self.transformer.transform_to_text(metadata))
+                except Exception as e:
+                    print(f"Error processing {file_path}: {e}")
+                    descriptions.append(None)
+
         results = []
-        
-        for file_path in tqdm(files, desc="Generating text features"):
-            with open(file_path, 'r') as f:
-                metadata = json.load(f)
-            
-            idx = metadata.get('idx')
-            output_path = self.output_dir / f"{idx}_mllm.json"
-            
-            # Skip if already exists (Resumable)
-            if output_path.exists():
+        for (file_path, metadata, output_path), description in zip(batch, descriptions):
+            if description is None:
                 continue
-            
-            try:
-                # Generate text description
-                description = self.transformer.transform_to_text(metadata)
-                
-                # Create result object
-                result = {
-                    'idx': idx,
-                    'url': metadata.get('url'),
-                    'label': metadata.get('label'),
-                    'text_description': description,
-                    'original_metadata_path': str(file_path)
-                }
-                
-                # Save individual result
-                output_path = self.output_dir / f"{idx}_mllm.json"
-                with open(output_path, 'w') as f:
-                    json.dump(result, f, indent=2)
-                
-                results.append(result)
-                
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
-        
+
+            # Create result object
+            result = {
+                'idx': metadata.get('idx'),
+                'url': metadata.get('url'),
+                'label': metadata.get('label'),
+                'text_description': description,
+                'original_metadata_path': str(file_path)
+            }
+
+            # Save individual result
+            writes[executor.submit(_write_result, output_path, result)] = output_path
+
+            results.append(result)
+
+        self._reap_writes(writes)
         return results
 
+    @staticmethod
+    def _reap_writes(writes, wait=False):
+        """Report failed writes and drop finished futures (all of them if wait)."""
+        for future in list(writes):
+            if not (wait or future.done()):
+                continue
+            output_path = writes.pop(future)
+            if future.exception() is not None:
+                print(f"Error writing {output_path}: {future.exception()}")
+
 if __name__ == "__main__":
     generator = TextFeatureGenerator()
     generator.generate_features()
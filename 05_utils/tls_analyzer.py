@@ -16,11 +16,266 @@ Version: 2.0.0
 import ssl
 import socket
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import copy
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse
 
+# ijson is optional: streams large crt.sh responses instead of parsing
+# the whole array into memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# HSTS max-age directive (directive names are case-insensitive and the
+# value may be quoted, RFC 6797 section 6.1)
+_HSTS_MAX_AGE_RE = re.compile(r'max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+def _summarize_ct_log(response: requests.Response) -> Tuple[int, Optional[str]]:
+    """
+    Count crt.sh entries and get the first entry's timestamp.
+    
+    Popular domains return megabytes of JSON of which only the length and
+    first timestamp are used, so the array is streamed when ijson is
+    available.
+    
+    Returns:
+        Tuple of (number of entries, first entry_timestamp or None)
+    """
+    if ijson is None:
+        data = response.json()
+        if not data:
+            return 0, None
+        return len(data), data[0].get('entry_timestamp')
+    
+    response.raw.decode_content = True  # Transparently gunzip
+    count = 0
+    first_timestamp = None
+    for timestamp in ijson.items(response.raw, 'item.entry_timestamp'):
+        if count == 0:
+            first_timestamp = timestamp
+        count += 1
+    return count, first_timestamp
+
+
+# Month abbreviations used by OpenSSL certificate dates
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+
+def _parse_cert_time(value: str) -> datetime:
+    """
+    Parse a certificate date such as 'Jun  1 12:00:00 2025 GMT'.
+    
+    The format is fixed ASCII, so it is split by hand rather than going
+    through strptime; anything unexpected falls back to strptime.
+    
+    Returns:
+        datetime: Timezone-aware UTC datetime
+    """
+    try:
+        month, day, clock, year = value.split()[:4]
+        hour, minute, second = clock.split(':')
+        return datetime(int(year), _MONTHS[month], int(day),
+                        int(hour), int(minute), int(second), tzinfo=timezone.utc)
+    except (ValueError, KeyError):
+        expiry = datetime.strptime(value, '%b %d %H:%M:%S %Y %Z')
+        return expiry.replace(tzinfo=timezone.utc)
+
+
+# Cache of analyze() results shared by analyzers with the same TTLs
+# Maps (hostname, port, cache_ttl, negative_ttl) -> (results, expiry time)
+_analysis_cache: Dict[Tuple[str, int, float, float], Tuple[Dict[str, Any], float]] = {}
+# Cache of crt.sh lookups; CT log contents change slowly
+# Maps hostname -> (ct results, expiry time)
+_ct_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+# Cache of resolved addresses for the TLS handshake
+# Maps (hostname, port) -> (((family, sockaddr), ...), expiry time)
+_dns_cache: Dict[Tuple[str, int], Tuple[Tuple[Tuple[int, tuple], ...], float]] = {}
+# Last TLS session per (hostname, port), offered again for resumption
+_tls_sessions: Dict[Tuple[str, int], ssl.SSLSession] = {}
+_cache_lock = threading.RLock()
+
+ANALYSIS_CACHE_TTL = 600      # Seconds to keep a successful analysis
+ANALYSIS_NEGATIVE_TTL = 120   # Seconds to keep a failed/invalid-cert analysis
+CT_CACHE_TTL = 3600           # Seconds to keep a crt.sh lookup
+DNS_CACHE_TTL = 300           # Seconds before a hostname is resolved again
+CACHE_MAX_ENTRIES = 4096
+
+
+def _cache_get(cache: Dict, key) -> Optional[Any]:
+    """Return a copy of an unexpired cache entry, or None."""
+    with _cache_lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del cache[key]
+            return None
+        return copy.deepcopy(entry[0])
+
+
+def _cache_put(cache: Dict, key, value: Any, ttl: float) -> None:
+    """Store a copy of value for ttl seconds (cache is reset when full)."""
+    if ttl <= 0:
+        return
+    with _cache_lock:
+        if len(cache) >= CACHE_MAX_ENTRIES:
+            cache.clear()
+        cache[key] = (copy.deepcopy(value), time.monotonic() + ttl)
+
+
+def _resolve(hostname: str, port: int) -> Tuple[Tuple[int, tuple], ...]:
+    """
+    Resolve hostname for a TCP connection, caching for DNS_CACHE_TTL.
+    
+    Returns:
+        Tuple of (address family, sockaddr), IPv4 addresses first
+    
+    Raises:
+        socket.gaierror: If the hostname cannot be resolved
+    """
+    addresses = _cache_get(_dns_cache, (hostname, port))
+    if addresses is None:
+        infos = socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+        addresses = tuple(sorted(
+            dict.fromkeys((family, sockaddr) for family, _, _, _, sockaddr in infos),
+            key=lambda address: address[0] != socket.AF_INET
+        ))
+        _cache_put(_dns_cache, (hostname, port), addresses, DNS_CACHE_TTL)
+    return addresses
+
+
+def _connect(hostname: str, port: int, timeout: float) -> socket.socket:
+    """Open a TCP connection using cached DNS, trying each address in turn."""
+    error = None
+    for family, sockaddr in _resolve(hostname, port):
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            # Send the small handshake flights immediately (no Nagle delay)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.settimeout(timeout)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error or OSError(f"No addresses found for {hostname}")
+
+
+# Shared HTTP session: keep-alive pooling and TLS session reuse for the
+# header probe and crt.sh lookups (created on first use)
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Get the shared, connection-pooling requests session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=32,
+                    pool_maxsize=64,
+                    max_retries=Retry(total=1, backoff_factor=0.1)
+                )
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+# Shared worker pool for the header probe and CT lookup, which run
+# alongside the TLS handshake (created on first use)
+_executor: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_WORKERS = 16
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared I/O thread pool."""
+    global _executor
+    if _executor is None:
+        with _session_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=_EXECUTOR_WORKERS, thread_name_prefix='tls-analyzer'
+                )
+    return _executor
+
+
+# Shared SSL contexts: CA certificates are loaded once, and sessions the
+# modern context creates can be resumed on later handshakes (created on
+# first use). The modern context only offers TLS 1.2+ with ECDHE AEAD
+# suites, which keeps the ClientHello small and the handshake cheap; the
+# legacy context is only used when a server can't negotiate with it.
+_ssl_context: Optional[ssl.SSLContext] = None
+_legacy_ssl_context: Optional[ssl.SSLContext] = None
+
+_MODERN_CIPHERS = 'ECDHE+AESGCM:ECDHE+CHACHA20:!aNULL:!MD5:!DSS'
+
+# Handshake failures meaning "no common protocol/cipher" rather than an
+# untrusted certificate or network problem
+_NEGOTIATION_FAILURES = frozenset([
+    'UNSUPPORTED_PROTOCOL',
+    'NO_PROTOCOLS_AVAILABLE',
+    'WRONG_VERSION_NUMBER',
+    'TLSV1_ALERT_PROTOCOL_VERSION',
+    'TLSV1_ALERT_INSUFFICIENT_SECURITY',
+    'SSLV3_ALERT_HANDSHAKE_FAILURE',
+    'NO_SHARED_CIPHER',
+    'NO_CIPHERS_AVAILABLE',
+])
+
+
+def _get_ssl_context() -> ssl.SSLContext:
+    """Get the shared, certificate-verifying modern SSL context."""
+    global _ssl_context
+    if _ssl_context is None:
+        with _session_lock:
+            if _ssl_context is None:
+                context = ssl.create_default_context()
+                context.check_hostname = True
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.minimum_version = ssl.TLSVersion.TLSv1_2
+                context.set_ciphers(_MODERN_CIPHERS)
+                _ssl_context = context
+    return _ssl_context
+
+
+def _get_legacy_ssl_context() -> ssl.SSLContext:
+    """Get the SSL context that also offers old protocols and ciphers."""
+    global _legacy_ssl_context
+    if _legacy_ssl_context is None:
+        with _session_lock:
+            if _legacy_ssl_context is None:
+                context = ssl.create_default_context()
+                context.check_hostname = True
+                context.verify_mode = ssl.CERT_REQUIRED
+                context.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+                context.set_ciphers('ALL:@SECLEVEL=0')
+                _legacy_ssl_context = context
+    return _legacy_ssl_context
+
+
+def clear_tls_cache():
+    """Clear cached TLS analysis, CT lookup and DNS results."""
+    with _cache_lock:
+        _analysis_cache.clear()
+        _ct_cache.clear()
+        _dns_cache.clear()
+        _tls_sessions.clear()
+
 
 class TLSSecurityAnalyzer:
     """
@@ -44,7 +299,7 @@ class TLSSecurityAnalyzer:
     }
     
     # Secure cipher suites
-    SECURE_CIPHERS = [
+    SECURE_CIPHERS = frozenset([
         'TLS_AES_256_GCM_SHA384',
         'TLS_CHACHA20_POLY1305_SHA256',
         'TLS_AES_128_GCM_SHA256',
@@ -52,7 +307,7 @@ class TLSSecurityAnalyzer:
         'ECDHE-RSA-AES128-GCM-SHA256',
         'ECDHE-ECDSA-AES256-GCM-SHA384',
         'ECDHE-RSA-AES256-GCM-SHA384',
-    ]
+    ])
     
     # Insecure cipher patterns
     INSECURE_CIPHER_PATTERNS = [
@@ -60,20 +315,55 @@ class TLSSecurityAnalyzer:
         'EXP', 'EXPORT', 'ANON', 'CBC'
     ]
     
-    def __init__(self, timeout: int = 5):
+    # All INSECURE_CIPHER_PATTERNS as one alternation (single scan)
+    _INSECURE_CIPHER_RE = re.compile('|'.join(map(re.escape, INSECURE_CIPHER_PATTERNS)))
+    
+    def __init__(self, timeout: int = 5,
+                 cache_ttl: float = ANALYSIS_CACHE_TTL,
+                 negative_ttl: float = ANALYSIS_NEGATIVE_TTL):
+        """
+        Args:
+            timeout: Network timeout in seconds
+            cache_ttl: Seconds to reuse a successful analysis (0 disables)
+            negative_ttl: Seconds to reuse a failed or invalid-certificate
+                analysis, so dead hosts are not retried immediately
+        """
         self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.negative_ttl = negative_ttl
     
-    def analyze(self, hostname: str, port: int = 443) -> Dict[str, Any]:
+    def analyze(self, hostname: str, port: int = 443, use_cache: bool = True) -> Dict[str, Any]:
         """
         Comprehensive TLS security analysis.
         
         Args:
             hostname: Domain to analyze
             port: Port number (default 443)
+            use_cache: Whether to reuse a recent result for this host
             
         Returns:
             dict: Complete security analysis results
         """
+        # Keyed by this analyzer's TTLs, so an entry another analyzer kept
+        # longer (or cache_ttl=0 here) is never served
+        key = (hostname, port, self.cache_ttl, self.negative_ttl)
+        if use_cache:
+            cached = _cache_get(_analysis_cache, key)
+            if cached is not None:
+                return cached
+        
+        results = self._analyze(hostname, port)
+        
+        failed = results['error'] is not None or not results['certificate']['valid']
+        # A timed-out CT lookup finishes into the CT cache in the background,
+        # so keep this result only briefly and pick up the answer next time
+        ttl = self.negative_ttl if failed or results['ct_timed_out'] else self.cache_ttl
+        _cache_put(_analysis_cache, key, results, ttl)
+        
+        return results
+    
+    def _analyze(self, hostname: str, port: int) -> Dict[str, Any]:
+        """Run the full (uncached) analysis for one host."""
         results = {
             'hostname': hostname,
             'port': port,
@@ -93,6 +383,7 @@ class TLSSecurityAnalyzer:
             'hsts_enabled': False,
             'hsts_max_age': None,
             'ct_logs_found': False,
+            'ct_timed_out': False,
             'ocsp_stapling': False,
             'security_score': 0,
             'warnings': [],
@@ -100,68 +391,79 @@ class TLSSecurityAnalyzer:
             'error': None
         }
         
+        # Steps 2 and 3 don't depend on the handshake, so they run in the
+        # background while step 1 runs here
+        executor = _get_executor()
+        headers_future = executor.submit(self._check_security_headers, hostname, port)
+        ct_future = executor.submit(self._check_certificate_transparency, hostname)
+        # crt.sh is often slow and only worth 5 points, so it gets a fixed
+        # budget. The header probe gets the same: cancel() can't stop a
+        # request already in flight, and the session's retry can double it
+        ct_deadline = headers_deadline = time.monotonic() + self.timeout * 2
+        
         try:
             # 1. Check HTTPS connectivity and get TLS info
             tls_info = self._get_tls_info(hostname, port)
-            results.update(tls_info)
+            self._merge_results(results, tls_info)
             results['supports_https'] = True
             
-            # 2. Check HTTP security headers
-            headers_info = self._check_security_headers(hostname, port)
-            results.update(headers_info)
-            
-            # 3. Check Certificate Transparency
-            ct_info = self._check_certificate_transparency(hostname)
-            results.update(ct_info)
+            # Steps 2 and 3 add at most 15 points (HSTS, CT); an insecure
+            # protocol or invalid certificate can't score well anyway, so
+            # don't wait on them
+            if results['tls_score'] < 20 or not results['certificate']['valid']:
+                headers_future.cancel()
+                ct_future.cancel()
+            else:
+                # 2. Check HTTP security headers (a probe still running at
+                # the deadline counts as a failed request: no HSTS)
+                try:
+                    headers_info = headers_future.result(
+                        timeout=max(0.0, headers_deadline - time.monotonic())
+                    )
+                    self._merge_results(results, headers_info)
+                except FutureTimeoutError:
+                    results['warnings'].append("Security header check timed out")
+                
+                # 3. Check Certificate Transparency (a late lookup still fills
+                # the CT cache; analyze() caches this result with negative_ttl)
+                try:
+                    ct_info = ct_future.result(timeout=max(0.0, ct_deadline - time.monotonic()))
+                    self._merge_results(results, ct_info)
+                except FutureTimeoutError:
+                    results['ct_timed_out'] = True
+                    results['warnings'].append("Certificate Transparency lookup timed out")
             
             # 4. Calculate overall security score
             results['security_score'] = self._calculate_security_score(results)
             
         except Exception as e:
+            headers_future.cancel()
+            ct_future.cancel()
             results['error'] = str(e)
             results['critical_issues'].append(f"TLS analysis failed: {str(e)}")
         
         return results
     
+    @staticmethod
+    def _merge_results(results: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """Merge a step's results, appending its warnings/issues rather than replacing them."""
+        results['warnings'].extend(update.pop('warnings', ()))
+        results['critical_issues'].extend(update.pop('critical_issues', ()))
+        results.update(update)
+    
     def _get_tls_info(self, hostname: str, port: int) -> Dict[str, Any]:
         """Get TLS connection information."""
-        results = {}
-        
-        # Create SSL context
-        context = ssl.create_default_context()
-        context.check_hostname = True
-        context.verify_mode = ssl.CERT_REQUIRED
+        results = {'warnings': [], 'critical_issues': []}
         
         try:
-            with socket.create_connection((hostname, port), timeout=self.timeout) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    # Get TLS version
-                    version = ssock.version()
-                    results['tls_version'] = version
-                    
-                    # Check if version is secure
-                    version_info = self.TLS_VERSIONS.get(version, {'secure': False, 'score': 0})
-                    results['tls_secure'] = version_info['secure']
-                    results['tls_score'] = version_info['score']
-                    
-                    if not version_info['secure'] and 'warning' in version_info:
-                        results['critical_issues'].append(version_info['warning'])
-                    
-                    # Get cipher suite
-                    cipher = ssock.cipher()
-                    results['cipher_suite'] = cipher[0]
-                    
-                    # Check cipher security
-                    results['cipher_secure'] = self._is_cipher_secure(cipher[0])
-                    if not results['cipher_secure']:
-                        results['warnings'].append(f"Weak cipher suite: {cipher[0]}")
-                    
-                    # Get certificate info
-                    cert = ssock.getpeercert()
-                    results['certificate'] = self._parse_certificate(cert)
-                    
-                    # Check OCSP stapling
-                    results['ocsp_stapling'] = self._check_ocsp_stapling(ssock)
+            try:
+                self._probe_tls(hostname, port, _get_ssl_context(), results, resume=True)
+            except ssl.SSLError as e:
+                if e.reason not in _NEGOTIATION_FAILURES:
+                    raise
+                # Server only speaks protocols/ciphers the modern context
+                # doesn't offer; probe again with the legacy one to grade it
+                self._probe_tls(hostname, port, _get_legacy_ssl_context(), results, resume=False)
                     
         except ssl.SSLError as e:
             results['critical_issues'].append(f"SSL Error: {str(e)}")
@@ -172,19 +474,62 @@ class TLSSecurityAnalyzer:
         
         return results
     
+    def _probe_tls(self, hostname: str, port: int, context: ssl.SSLContext,
+                   results: Dict[str, Any], resume: bool) -> None:
+        """
+        Handshake with the server and record protocol, cipher and certificate.
+        
+        Args:
+            hostname: Domain to connect to
+            port: Port number
+            context: SSL context to handshake with
+            results: Dict the findings are written to
+            resume: Whether to offer/store a TLS session for resumption
+        """
+        key = (hostname, port)
+        session = _tls_sessions.get(key) if resume else None
+        
+        with _connect(hostname, port, self.timeout) as sock:
+            # Offer the previous session so repeat probes can resume
+            with context.wrap_socket(sock, server_hostname=hostname, session=session) as ssock:
+                # Get TLS version
+                version = ssock.version()
+                results['tls_version'] = version
+                
+                # Check if version is secure
+                version_info = self.TLS_VERSIONS.get(version, {'secure': False, 'score': 0})
+                results['tls_secure'] = version_info['secure']
+                results['tls_score'] = version_info['score']
+                
+                if not version_info['secure'] and 'warning' in version_info:
+                    results['critical_issues'].append(version_info['warning'])
+                
+                # Get cipher suite
+                cipher = ssock.cipher()
+                results['cipher_suite'] = cipher[0]
+                
+                # Check cipher security
+                results['cipher_secure'] = self._is_cipher_secure(cipher[0])
+                if not results['cipher_secure']:
+                    results['warnings'].append(f"Weak cipher suite: {cipher[0]}")
+                
+                # Get certificate info
+                cert = ssock.getpeercert()
+                results['certificate'] = self._parse_certificate(cert)
+                
+                # Check OCSP stapling
+                results['ocsp_stapling'] = self._check_ocsp_stapling(ssock)
+                
+                if resume and ssock.session is not None:
+                    with _cache_lock:
+                        if len(_tls_sessions) >= CACHE_MAX_ENTRIES:
+                            _tls_sessions.clear()
+                        _tls_sessions[key] = ssock.session
+    
     def _is_cipher_secure(self, cipher: str) -> bool:
         """Check if cipher suite is secure."""
-        # Check if in secure list
-        if cipher in self.SECURE_CIPHERS:
-            return True
-        
-        # Check for insecure patterns
-        for pattern in self.INSECURE_CIPHER_PATTERNS:
-            if pattern in cipher:
-                return False
-        
-        # Default to cautious
-        return True
+        # Secure list first, then insecure patterns; default to cautious
+        return cipher in self.SECURE_CIPHERS or not self._INSECURE_CIPHER_RE.search(cipher)
     
     def _parse_certificate(self, cert: Dict) -> Dict[str, Any]:
         """Parse certificate information."""
@@ -204,19 +549,18 @@ class TLSSecurityAnalyzer:
         # Parse subject
         subject = cert.get('subject')
         if subject:
-            cert_info['subject'] = dict(x[0] for x in subject)
+            cert_info['subject'] = dict([x[0] for x in subject])
         
         # Parse issuer
         issuer = cert.get('issuer')
         if issuer:
-            cert_info['issuer'] = dict(x[0] for x in issuer)
+            cert_info['issuer'] = dict([x[0] for x in issuer])
         
         # Parse expiration
         not_after = cert.get('notAfter')
         if not_after:
             try:
-                expiry = datetime.strptime(not_after, '%b %d %H:%M:%S %Y %Z')
-                expiry = expiry.replace(tzinfo=timezone.utc)
+                expiry = _parse_cert_time(not_after)
                 now = datetime.now(timezone.utc)
                 cert_info['expires_in_days'] = (expiry - now).days
                 
@@ -238,13 +582,14 @@ class TLSSecurityAnalyzer:
         return cert_info
     
     def _check_ocsp_stapling(self, ssock: ssl.SSLSocket) -> bool:
-        """Check if OCSP stapling is enabled."""
-        try:
-            # Try to get OCSP response
-            ocsp_response = ssock.ocsp_response()
-            return ocsp_response is not None
-        except:
-            return False
+        """
+        Check if OCSP stapling is enabled.
+        
+        The stdlib ssl module has no API for reading the stapled OCSP
+        response off an SSLSocket, so stapling can't be observed here and
+        is reported as absent.
+        """
+        return False
     
     def _check_security_headers(self, hostname: str, port: int) -> Dict[str, Any]:
         """Check HTTP security headers."""
@@ -256,14 +601,14 @@ class TLSSecurityAnalyzer:
         try:
             # Make HTTPS request
             url = f"https://{hostname}:{port}"
-            response = requests.get(url, timeout=self.timeout, verify=True)
+            response = _get_session().get(url, timeout=self.timeout, verify=True)
             
             # Check HSTS
             hsts = response.headers.get('Strict-Transport-Security')
             if hsts:
                 results['hsts_enabled'] = True
                 # Parse max-age
-                match = re.search(r'max-age=(\d+)', hsts)
+                match = _HSTS_MAX_AGE_RE.search(hsts)
                 if match:
                     results['hsts_max_age'] = int(match.group(1))
                     
@@ -280,26 +625,34 @@ class TLSSecurityAnalyzer:
         return results
     
     def _check_certificate_transparency(self, hostname: str) -> Dict[str, Any]:
-        """Check Certificate Transparency logs."""
+        """Check Certificate Transparency logs (cached for CT_CACHE_TTL)."""
+        cached = _cache_get(_ct_cache, hostname)
+        if cached is not None:
+            return cached
+        
         results = {'ct_logs_found': False}
         
         try:
-            # Query crt.sh for CT logs
-            url = f"https://crt.sh/?q={hostname}&output=json"
-            response = requests.get(url, timeout=self.timeout)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data and len(data) > 0:
-                    results['ct_logs_found'] = True
-                    results['ct_entries'] = len(data)
-                    
-                    # Check for recently issued certificates
-                    if len(data) > 0:
-                        latest = data[0]
-                        entry_time = latest.get('entry_timestamp')
+            # Query crt.sh for CT logs (gzip-compressed, streamed)
+            with _get_session().get(
+                "https://crt.sh/",
+                params={'q': hostname, 'output': 'json', 'deduplicate': 'Y'},
+                headers={'Accept-Encoding': 'gzip'},
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                if response.status_code == 200:
+                    entries, entry_time = _summarize_ct_log(response)
+                    if entries > 0:
+                        results['ct_logs_found'] = True
+                        results['ct_entries'] = entries
+                        
+                        # Check for recently issued certificates
                         if entry_time:
                             results['latest_cert_date'] = entry_time
+                    
+                    # Only cache answers from crt.sh, not transient failures
+                    _cache_put(_ct_cache, hostname, results, CT_CACHE_TTL)
         
         except Exception:
             # CT check failed, but don't fail the whole analysis
@@ -385,6 +738,24 @@ class TLSSecurityAnalyzer:
         }
 
 
+# Shared analyzer for the convenience functions below
+_ANALYZER = TLSSecurityAnalyzer()
+
+# Features for non-HTTPS URLs (same values quick_check's HTTP result yields)
+_NON_HTTPS_FEATURES = {
+    'uses_https': False,
+    'tls_version': 'unknown',
+    'tls_secure': False,
+    'cert_valid': False,
+    'cert_days_remaining': -1,
+    'hsts_enabled': False,
+    'ct_logs': False,
+    'tls_security_score': 0,
+    'tls_risk_score': 40,  # Penalty for HTTP
+    'has_tls_issues': False,
+}
+
+
 def extract_tls_features(url: str) -> Dict[str, Any]:
     """
     Convenience function to extract TLS features for ML model.
@@ -395,8 +766,11 @@ def extract_tls_features(url: str) -> Dict[str, Any]:
     Returns:
         dict: TLS features for ML model
     """
-    analyzer = TLSSecurityAnalyzer()
-    results = analyzer.quick_check(url)
+    # Fast path: nothing to analyze for plain HTTP
+    if urlparse(url).scheme != 'https':
+        return dict(_NON_HTTPS_FEATURES)
+    
+    results = _ANALYZER.quick_check(url)
     
     return {
         'uses_https': results['supports_https'],
@@ -412,6 +786,31 @@ def extract_tls_features(url: str) -> Dict[str, Any]:
     }
 
 
+def extract_tls_features_batch(urls: List[str], max_workers: int = 16) -> List[Dict[str, Any]]:
+    """
+    Extract TLS features for many URLs concurrently.
+    
+    Handshakes are network-bound, so URLs are analyzed in a thread pool
+    sharing the module's caches, session and SSL context. Duplicate URLs
+    are analyzed once.
+    
+    Args:
+        urls: URLs to analyze
+        max_workers: Maximum concurrent analyses
+        
+    Returns:
+        list: TLS feature dicts, in the same order as urls
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    
+    # A private pool: analyses wait on the shared pool's header/CT tasks,
+    # so running them inside it could starve it
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        features = dict(zip(unique_urls, executor.map(extract_tls_features, unique_urls)))
+    
+    return [dict(features[url]) for url in urls]
+
+
 def demo():
     """Demonstrate TLS analyzer."""
     print("=" * 70)
@@ -16,14 +16,37 @@ IMPORTANT CHANGES:
 
 import os
 import re
+import sys
 import json
-from difflib import SequenceMatcher
+import unicodedata
+from difflib import SequenceMatcher, get_close_matches
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import tldextract
 from typing import Dict, List, Optional, Set
 
+# rapidfuzz is optional: native bit-parallel scoring, used as a prefilter.
+# Its Indel ratio is never below SequenceMatcher.ratio() (matching blocks
+# form a common subsequence), so a cutoff on it only over-selects; the
+# reported scores still come from SequenceMatcher.
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+# pyahocorasick is optional: finds every brand in a string in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Upper bound on cached analyze() results per detector
+ANALYSIS_CACHE_MAX_ENTRIES = 8192
+
 # Get project root
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TLD_JSON_PATH = os.path.join(PROJECT_ROOT, '01_data', 'external', 'tld_list.json')
+CONFUSABLES_PATH = os.path.join(PROJECT_ROOT, '01_data', 'external', 'confusables.txt')
 
 
 def load_valid_tlds() -> Set[str]:
@@ -60,8 +83,20 @@ def _get_fallback_tlds() -> Set[str]:
     }
 
 
-# Load TLDs at module import time
-VALID_TLDS = load_valid_tlds()
+# Load TLDs at module import time (frozen: shared by every detector)
+VALID_TLDS = frozenset(load_valid_tlds())
+
+# Shared domain splitter using tldextract's bundled Public Suffix List
+# snapshot, so the first analyze() never blocks on a network fetch or
+# touches the on-disk cache and its file lock. Picking up suffix list
+# changes therefore means upgrading tldextract.
+_TLD_EXTRACTOR = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+@lru_cache(maxsize=8192)
+def _extract(url: str):
+    """Split url into subdomain, domain and suffix (memoized, treat as read-only)."""
+    return _TLD_EXTRACTOR(url)
 
 
 # Major brands that are commonly impersonated
@@ -119,6 +154,12 @@ PROTECTED_BRANDS = {
 }
 
 
+# rapidfuzz prefilter cutoffs, a point under the 0.7 brand and 0.75 TLD
+# thresholds so float rounding can't drop a pair that reaches them
+BRAND_PREFILTER_CUTOFF = 69
+TLD_PREFILTER_CUTOFF = 74
+
+
 # Common character substitutions used in typosquatting
 HOMOGLYPHS = {
     'a': ['4', '@', 'α', 'а'],  # Cyrillic 'a'
@@ -139,6 +180,97 @@ HOMOGLYPHS = {
 }
 
 
+def _build_homoglyph_table(homoglyphs: Dict[str, List[str]]) -> Dict[int, str]:
+    """
+    Fold the ordered single-character substitutions into one translate table.
+    
+    Each substitute maps to what the replacements, applied in dict order,
+    would have turned it into (e.g. '1' -> 'i' -> 'l').
+    """
+    table = {}
+    for substitutes in homoglyphs.values():
+        for sub in substitutes:
+            if len(sub) != 1:
+                continue
+            result = sub
+            for char, subs in homoglyphs.items():
+                for other in subs:
+                    if len(other) == 1:
+                        result = result.replace(other, char)
+            table[ord(sub)] = result
+    return table
+
+
+def load_confusables() -> Dict[int, str]:
+    """
+    Load Unicode lookalikes of ASCII letters and digits from confusables.txt.
+    
+    The file is the Unicode Consortium's confusables table (UTS #39). Only
+    single non-ASCII characters whose prototype is one ASCII letter or digit
+    are kept; ASCII substitutions stay with HOMOGLYPHS. Returns an empty
+    table if the file isn't present.
+    """
+    table = {}
+    try:
+        with open(CONFUSABLES_PATH, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split(';')
+                if len(fields) < 2:
+                    continue
+                source, target = fields[0].split(), fields[1].split()
+                if len(source) != 1 or len(target) != 1:
+                    continue
+                codepoint = int(source[0], 16)
+                prototype = chr(int(target[0], 16)).lower()
+                if codepoint >= 0x80 and prototype.isascii() and prototype.isalnum():
+                    table[codepoint] = prototype
+    except FileNotFoundError:
+        return {}
+    return table
+
+
+CONFUSABLES = load_confusables()
+
+
+# analyze_batch(max_workers=...) only shards batches with more new URLs
+# than this, in chunks of PARALLEL_CHUNK_SIZE
+PARALLEL_BATCH_MIN = 1024
+PARALLEL_CHUNK_SIZE = 256
+
+# Detector used inside analyze_batch worker processes
+_batch_worker_detector = None
+
+
+def _init_batch_worker(detector: 'TyposquattingDetector'):
+    """Install the detector (pickled once per worker process)."""
+    global _batch_worker_detector
+    _batch_worker_detector = detector
+
+
+def _analyze_chunk(urls: List[str]) -> List[dict]:
+    """Analyze one shard of a batch in a worker process."""
+    return _batch_worker_detector.analyze_batch(urls, use_cache=False)
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy a cached result; callers (e.g. verify_with_content) update it in place."""
+    return dict(result, details=list(result['details']))
+
+
+# Non-financial/non-brand keywords in page content that suggest legitimacy
+LEGITIMATE_INDICATORS = (
+    'school', 'college', 'university', 'education', 'academy',
+    'hospital', 'clinic', 'medical', 'healthcare',
+    'restaurant', 'cafe', 'hotel', 'resort',
+    'church', 'temple', 'mosque', 'religious',
+    'news', 'blog', 'magazine', 'media',
+    'government', 'municipal', 'council',
+    'ngo', 'foundation', 'charity', 'trust',
+    'sports', 'club', 'association',
+    'real estate', 'properties', 'realty',
+)
+
+
 # Common TLD typos (suspicious TLDs that look like real ones)
 TLD_TYPOS = {
     # Typos of .com
@@ -183,8 +315,74 @@ class TyposquattingDetector:
         self.homoglyphs = HOMOGLYPHS
         self.tld_typos = TLD_TYPOS
         self.valid_tlds = VALID_TLDS
+        # Brand names interned, and (industry, keywords) per brand unpacked
+        # once here instead of per URL
+        self._brand_list = [sys.intern(brand) for brand in self.brands]
+        self._brand_rank = {brand: rank for rank, brand in enumerate(self._brand_list)}
+        self._brand_profiles = {
+            brand: (brand_info.get('industry', ''), brand_info.get('keywords', []))
+            for brand, brand_info in zip(self._brand_list, self.brands.values())
+        }
+        
+        # Legitimate brand domains (lowercased once to match full_domain),
+        # matched exactly or as a parent domain on a dot boundary
+        self._legit_domains = frozenset(
+            legit.lower() for brand_info in self.brands.values()
+            for legit in brand_info['domains']
+        )
+        self._legit_subdomain_suffixes = tuple('.' + legit for legit in self._legit_domains)
+        self._brand_automaton = None
+        self._indicator_automaton = None
+        if ahocorasick is not None:
+            self._brand_automaton = ahocorasick.Automaton()
+            for brand in self._brand_list:
+                self._brand_automaton.add_word(brand, brand)
+            self._brand_automaton.make_automaton()
+            
+            # Legitimacy indicators for verify_with_content, found in one
+            # pass over the page text
+            self._indicator_automaton = ahocorasick.Automaton()
+            for indicator in LEGITIMATE_INDICATORS:
+                self._indicator_automaton.add_word(indicator, indicator)
+            self._indicator_automaton.make_automaton()
+        
+        # Homoglyph normalization: multi-character sequences ('vv') are
+        # replaced first, then everything else in one translate pass
+        self._homoglyph_sequences = {
+            sub: char for char, subs in self.homoglyphs.items()
+            for sub in subs if len(sub) > 1
+        }
+        # One alternation over all sequences, longest first, so they are
+        # replaced in a single left-to-right pass however many there are
+        self._homoglyph_sequence_re = None
+        if self._homoglyph_sequences:
+            self._homoglyph_sequence_re = re.compile('|'.join(
+                re.escape(sub) for sub in sorted(self._homoglyph_sequences, key=len, reverse=True)
+            ))
+        self._homoglyph_table = _build_homoglyph_table(self.homoglyphs)
+        # Unicode lookalikes become their ASCII prototype, which then goes
+        # through HOMOGLYPHS like any other character (HOMOGLYPHS entries win)
+        for codepoint, prototype in CONFUSABLES.items():
+            self._homoglyph_table.setdefault(
+                codepoint, self._homoglyph_table.get(ord(prototype), prototype)
+            )
+        # ASCII characters normalization actually changes; an ASCII domain
+        # with none of them is its own normalized form
+        self._homoglyph_ascii = frozenset(
+            chr(codepoint) for codepoint, char in self._homoglyph_table.items()
+            if codepoint < 128 and char != chr(codepoint)
+        ).union(*self._homoglyph_sequences)
+        
+        # Valid TLDs considered when suggesting a fix for an invalid one
+        # (sorted, so suggestions don't depend on set iteration order)
+        self._tld_candidates = tuple(sorted(self.valid_tlds))
         
-    def analyze(self, url: str, page_content: Optional[Dict] = None) -> dict:
+        # analyze() results by URL; the tables above never change, so
+        # entries don't expire
+        self._cache: Dict[str, dict] = {}
+        
+    def analyze(self, url: str, page_content: Optional[Dict] = None,
+                use_cache: bool = True) -> dict:
         """
         Analyze URL for typosquatting/brand impersonation.
         
@@ -192,16 +390,97 @@ class TyposquattingDetector:
             url: The URL to analyze
             page_content: Optional dict with 'title', 'text', 'industry_keywords'
                          for content-based verification
+            use_cache: Reuse the result of an earlier analysis of this URL
         
         Returns:
             dict with detection results
         """
-        extracted = tldextract.extract(url)
+        if use_cache:
+            cached = self._cache.get(url)
+            if cached is not None:
+                return _copy_result(cached)
+        
+        results = self._analyze(url)
+        self._store(url, results)
+        return results
+    
+    def analyze_batch(self, urls: List[str], use_cache: bool = True,
+                      max_workers: Optional[int] = None) -> List[dict]:
+        """
+        Analyze many URLs at once.
+        
+        Brand candidates for all new domains are prefiltered in a single
+        native rapidfuzz call spread over every core, rather than once per URL.
+        Duplicate URLs are analyzed once.
+        
+        Args:
+            urls: URLs to analyze
+            use_cache: Reuse the results of earlier analyses of these URLs
+            max_workers: If > 1, shard large batches across this many
+                         processes (worth it for thousands of new URLs)
+        
+        Returns:
+            List of analyze() results, in the order of urls
+        """
+        results = {}
+        if use_cache:
+            for url in urls:
+                cached = self._cache.get(url)
+                if cached is not None:
+                    results[url] = cached
+        
+        pending = [url for url in dict.fromkeys(urls) if url not in results]
+        
+        if max_workers and max_workers > 1 and len(pending) > PARALLEL_BATCH_MIN:
+            chunks = [pending[i:i + PARALLEL_CHUNK_SIZE]
+                      for i in range(0, len(pending), PARALLEL_CHUNK_SIZE)]
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker,
+                                     initargs=(self,)) as executor:
+                for chunk, chunk_results in zip(chunks, executor.map(_analyze_chunk, chunks)):
+                    results.update(zip(chunk, chunk_results))
+        else:
+            domains = [_extract(url).domain.lower() for url in pending]
+            for url, similarities in zip(pending, self._batch_similarities(domains)):
+                results[url] = self._analyze(url, similarities)
+        
+        for url in pending:
+            self._store(url, results[url])
+        
+        return [_copy_result(results[url]) for url in urls]
+    
+    def __getstate__(self):
+        # Worker processes get the tables, not this detector's cache
+        state = self.__dict__.copy()
+        state['_cache'] = {}
+        return state
+    
+    def clear_cache(self):
+        """Drop all cached analyze() results."""
+        self._cache.clear()
+    
+    def _store(self, url: str, results: dict):
+        """Cache a copy of the analyze() result for url."""
+        if len(self._cache) >= ANALYSIS_CACHE_MAX_ENTRIES:
+            self._cache.clear()
+        self._cache[url] = _copy_result(results)
+    
+    def _analyze(self, url: str, similarities: Optional[Dict[str, float]] = None) -> dict:
+        """
+        Run the typosquatting checks for one URL (uncached).
+        
+        Args:
+            url: The URL to analyze
+            similarities: Precomputed _brand_similarities() of the URL's
+                          domain, if already scored in a batch
+        """
+        tld_typos = self.tld_typos
+        valid_tlds = self.valid_tlds
+        
+        extracted = _extract(url)
         domain = extracted.domain.lower()
         suffix = extracted.suffix.lower()
         subdomain = extracted.subdomain.lower()
-        full_domain = f"{extracted.subdomain}.{extracted.domain}.{extracted.suffix}".lower()
-        full_domain = full_domain.strip('.')
+        full_domain = '.'.join(part for part in (subdomain, domain, suffix) if part)
         
         results = {
             'is_typosquatting': False,
@@ -214,10 +493,10 @@ class TyposquattingDetector:
         }
         
         # SPECIAL CASE: When TLD is invalid, tldextract puts real domain in subdomain
-        if not suffix and domain in self.tld_typos:
+        if not suffix and domain in tld_typos:
             real_domain = subdomain
             fake_tld = domain
-            intended_tld = self.tld_typos[fake_tld]
+            intended_tld = tld_typos[fake_tld]
             
             results['is_typosquatting'] = True
             results['impersonated_brand'] = None
@@ -228,26 +507,28 @@ class TyposquattingDetector:
             return results
         
         # Check 0: TLD Typosquatting with valid suffix format
-        if suffix in self.tld_typos:
+        if suffix in tld_typos:
             results['is_typosquatting'] = True
             results['impersonated_brand'] = None
             results['detection_method'] = 'faulty_extension'
             results['similarity_score'] = 0.9
             results['risk_increase'] = 55
-            intended_tld = self.tld_typos[suffix]
+            intended_tld = tld_typos[suffix]
             results['details'].append(f"Faulty or incorrect extension: '.{suffix}' (Did you mean '.{intended_tld}'?)")
             return results
         
         # Check 0.5: Invalid Domain Structure
-        if '.' not in url.split('//')[-1]: 
-            if url.split('//')[-1] != 'localhost':
-                results['is_typosquatting'] = True
-                results['impersonated_brand'] = None
-                results['detection_method'] = 'invalid_domain_structure'
-                results['similarity_score'] = 1.0
-                results['risk_increase'] = 80
-                results['details'].append(f"Invalid domain structure: '{url}'. Missing valid extension.")
-                return results
+        # (no dot anywhere after the last '//', found without slicing)
+        slashes = url.rfind('//')
+        start = slashes + 2 if slashes != -1 else 0
+        if url.find('.', start) == -1 and url[start:] != 'localhost':
+            results['is_typosquatting'] = True
+            results['impersonated_brand'] = None
+            results['detection_method'] = 'invalid_domain_structure'
+            results['similarity_score'] = 1.0
+            results['risk_increase'] = 80
+            results['details'].append(f"Invalid domain structure: '{url}'. Missing valid extension.")
+            return results
 
         # Check TLD validity using the comprehensive list
         # Handle multi-part TLDs like "co.in", "bank.in"
@@ -256,20 +537,20 @@ class TyposquattingDetector:
             suffix_parts = suffix.split('.')
             
             # Check if full suffix is valid (e.g., "co.in")
-            if suffix in self.valid_tlds:
+            if suffix in valid_tlds:
                 pass  # Valid
             # Check if last part is valid (e.g., "in" from "bank.in")
-            elif suffix_parts[-1] in self.valid_tlds:
+            elif suffix_parts[-1] in valid_tlds:
                 pass  # Valid - the base TLD exists
             # Check if it's a two-part TLD where both parts are valid
             elif len(suffix_parts) == 2:
                 # Check formats like "bank.in" where "bank" is a gTLD and "in" is a ccTLD
                 # This is actually valid for some newer domains
-                if suffix_parts[0] in self.valid_tlds and suffix_parts[1] in self.valid_tlds:
+                if suffix_parts[0] in valid_tlds and suffix_parts[1] in valid_tlds:
                     pass  # Valid - both parts are valid TLDs
                 else:
                     # Only flag if neither part is a valid TLD
-                    if suffix_parts[0] not in self.valid_tlds and suffix_parts[1] not in self.valid_tlds:
+                    if suffix_parts[0] not in valid_tlds and suffix_parts[1] not in valid_tlds:
                         results['is_typosquatting'] = True
                         results['detection_method'] = 'invalid_extension'
                         results['similarity_score'] = 1.0
@@ -284,11 +565,7 @@ class TyposquattingDetector:
                 results['risk_increase'] = 75
                 
                 # Check for similar valid TLD
-                similar_tld = None
-                for valid in list(self.valid_tlds)[:100]:  # Check first 100 for performance
-                    if SequenceMatcher(None, suffix, valid).ratio() >= 0.75:
-                        similar_tld = valid
-                        break
+                similar_tld = self._similar_tld(suffix)
                 
                 if similar_tld:
                     msg = f"Invalid extension '.{suffix}' (Likely typo of '.{similar_tld}')"
@@ -298,22 +575,34 @@ class TyposquattingDetector:
                 results['details'].append(msg)
                 return results
         
-        # Check each brand for impersonation
-        for brand, brand_info in self.brands.items():
-            legitimate_domains = brand_info['domains'] if isinstance(brand_info, dict) else brand_info
-            if isinstance(brand_info, dict):
-                industry = brand_info.get('industry', '')
-                brand_keywords = brand_info.get('keywords', [])
-            else:
-                industry = ''
-                brand_keywords = []
+        # A brand's own domain (or a subdomain of it) impersonates nothing
+        if full_domain in self._legit_domains or full_domain.endswith(self._legit_subdomain_suffixes):
+            return results
+        
+        brands_in_domain = self._find_brands(domain)
+        if domain.isascii() and self._homoglyph_ascii.isdisjoint(domain):
+            brands_in_normalized = brands_in_domain
+        else:
+            brands_in_normalized = self._find_brands(self._normalize_homoglyphs(domain))
+        
+        # Similarity of the domain to the brands, scored in one pass. Brands
+        # ranked after the first exact hit (check 1) can never be reported,
+        # so only those before it are scored
+        if similarities is None:
+            hits = brands_in_domain
+            rank = min(map(self._brand_rank.__getitem__, hits)) if hits else len(self._brand_list)
+            similarities = self._brand_similarities(domain, self._brand_list[:rank])
+        
+        # Check each brand for impersonation. Only brands found by one of
+        # checks 1-3 can match (usually none), visited in PROTECTED_BRANDS
+        # order so the first match wins as before
+        candidates = (brands_in_domain | brands_in_normalized).union(similarities)
+        
+        for brand in sorted(candidates, key=self._brand_rank.__getitem__):
+            industry, brand_keywords = self._brand_profiles[brand]
             
-            # Skip if this IS a legitimate domain
-            if any(full_domain.endswith(legit) for legit in legitimate_domains):
-                continue
-                
             # Check 1: Exact brand name in domain (but not legitimate)
-            if brand in domain:
+            if brand in brands_in_domain:
                 results['is_typosquatting'] = True
                 results['impersonated_brand'] = brand
                 results['detection_method'] = 'brand_in_domain'
@@ -326,7 +615,7 @@ class TyposquattingDetector:
                 break
             
             # Check 2: Levenshtein similarity
-            similarity = SequenceMatcher(None, domain, brand).ratio()
+            similarity = similarities.get(brand, 0.0)
             if similarity > 0.7 and similarity < 1.0:
                 results['is_typosquatting'] = True
                 results['impersonated_brand'] = brand
@@ -338,8 +627,7 @@ class TyposquattingDetector:
                 break
             
             # Check 3: Homoglyph substitution
-            normalized = self._normalize_homoglyphs(domain)
-            if normalized == brand or brand in normalized:
+            if brand in brands_in_normalized:
                 results['is_typosquatting'] = True
                 results['impersonated_brand'] = brand
                 results['detection_method'] = 'homoglyph_substitution'
@@ -350,8 +638,9 @@ class TyposquattingDetector:
         
         # Check 4: Brand in subdomain (subdomain attack)
         if not results['is_typosquatting'] and extracted.subdomain:
-            for brand in self.brands.keys():
-                if brand in extracted.subdomain.lower():
+            brands_in_subdomain = self._find_brands(subdomain)
+            for brand in self._brand_list:
+                if brand in brands_in_subdomain:
                     results['is_typosquatting'] = True
                     results['impersonated_brand'] = brand
                     results['detection_method'] = 'subdomain_attack'
@@ -398,33 +687,22 @@ class TyposquattingDetector:
         text_lower = (page_text or "").lower()
         combined = f"{title_lower} {text_lower}"
         
-        # Non-financial/non-brand keywords that suggest legitimacy
-        legitimate_indicators = [
-            'school', 'college', 'university', 'education', 'academy',
-            'hospital', 'clinic', 'medical', 'healthcare',
-            'restaurant', 'cafe', 'hotel', 'resort',
-            'church', 'temple', 'mosque', 'religious',
-            'news', 'blog', 'magazine', 'media',
-            'government', 'municipal', 'council',
-            'ngo', 'foundation', 'charity', 'trust',
-            'sports', 'club', 'association',
-            'real estate', 'properties', 'realty',
-        ]
-        
-        # Check for legitimate indicators
-        found_legitimate = False
-        for indicator in legitimate_indicators:
-            if indicator in combined:
-                found_legitimate = True
-                break
-        
-        # Check if expected industry keywords are present
+        # Check if expected industry keywords are present (a handful, and
+        # a match decides the outcome on its own)
         industry_match = False
         for keyword in expected_keywords:
             if keyword in combined:
                 industry_match = True
                 break
         
+        # Check for legitimate indicators (only matters without a match)
+        found_legitimate = False
+        if not industry_match:
+            if self._indicator_automaton is not None:
+                found_legitimate = next(self._indicator_automaton.iter(combined), None) is not None
+            else:
+                found_legitimate = any(indicator in combined for indicator in LEGITIMATE_INDICATORS)
+        
         # If we found legitimate indicators but NO industry keywords, likely not impersonation
         if found_legitimate and not industry_match:
             typosquat_result['is_typosquatting'] = False
@@ -439,13 +717,107 @@ class TyposquattingDetector:
         
         return typosquat_result
     
+    def _find_brands(self, text: str) -> Set[str]:
+        """Return every brand keyword occurring in text (single scan)."""
+        if not text:
+            return set()
+        if self._brand_automaton is not None:
+            return {brand for _, brand in self._brand_automaton.iter(text)}
+        return {brand for brand in self._brand_list if brand in text}
+    
+    def _brand_similarities(self, domain: str, brands: Optional[List[str]] = None) -> Dict[str, float]:
+        """
+        Score domain against many brands at once.
+        
+        Args:
+            domain: Domain to score
+            brands: Brands to score against (default: all)
+        
+        Returns:
+            dict of brand -> similarity, for brands scoring at least 0.7
+        """
+        if brands is None:
+            brands = self._brand_list
+        
+        if process is not None:
+            matches = process.extract(
+                domain, brands, scorer=fuzz.ratio,
+                score_cutoff=BRAND_PREFILTER_CUTOFF, limit=None
+            )
+            return self._confirm_similarities(domain, [brand for brand, _, _ in matches])
+        
+        similarities = {}
+        domain_len = len(domain)
+        for brand in brands:
+            # ratio() <= 2*min(len)/total, so skip brands whose length alone
+            # rules out reaching 0.7
+            if 2 * min(domain_len, len(brand)) < 0.7 * (domain_len + len(brand)):
+                continue
+            similarity = SequenceMatcher(None, domain, brand).ratio()
+            if similarity >= 0.7:
+                similarities[brand] = similarity
+        return similarities
+    
+    def _batch_similarities(self, domains: List[str]) -> List[Optional[Dict[str, float]]]:
+        """
+        Score many domains against all brands in one call.
+        
+        Returns:
+            _brand_similarities() of each domain, or None for each if
+            rapidfuzz isn't available (scored one by one later)
+        """
+        if process is None or not domains:
+            return [None] * len(domains)
+        
+        import numpy as np
+        
+        # float64 so the prefilter agrees with process.extract in _brand_similarities
+        scores = process.cdist(
+            domains, self._brand_list, scorer=fuzz.ratio,
+            score_cutoff=BRAND_PREFILTER_CUTOFF, dtype=np.float64, workers=-1
+        )
+        return [
+            self._confirm_similarities(
+                domain, [brand for brand, score in zip(self._brand_list, row) if score]
+            )
+            for domain, row in zip(domains, scores)
+        ]
+    
+    @staticmethod
+    def _confirm_similarities(domain: str, candidates: List[str]) -> Dict[str, float]:
+        """Score prefiltered brands with SequenceMatcher, keeping those >= 0.7."""
+        similarities = {}
+        for brand in candidates:
+            similarity = SequenceMatcher(None, domain, brand).ratio()
+            if similarity >= 0.7:
+                similarities[brand] = similarity
+        return similarities
+    
+    def _similar_tld(self, suffix: str) -> Optional[str]:
+        """Return a valid TLD the suffix is likely a typo of, or None."""
+        candidates = self._tld_candidates
+        if process is not None:
+            candidates = [
+                tld for tld, _, _ in process.extract(
+                    suffix, candidates, scorer=fuzz.ratio,
+                    score_cutoff=TLD_PREFILTER_CUTOFF, limit=None
+                )
+            ]
+        
+        matches = get_close_matches(suffix, candidates, n=1, cutoff=0.75)
+        return matches[0] if matches else None
+    
     def _normalize_homoglyphs(self, text: str) -> str:
         """Replace homoglyphs with their standard character."""
+        if not text.isascii():
+            # Fold compatibility forms (fullwidth, math alphanumerics, ...)
+            text = unicodedata.normalize('NFKC', text)
         result = text.lower()
-        for char, substitutes in self.homoglyphs.items():
-            for sub in substitutes:
-                result = result.replace(sub, char)
-        return result
+        if self._homoglyph_sequence_re is not None:
+            result = self._homoglyph_sequence_re.sub(
+                lambda m: self._homoglyph_sequences[m.group(0)], result
+            )
+        return result.translate(self._homoglyph_table)
     
     def get_brand_similarity(self, domain: str, brand: str) -> float:
         """Calculate similarity between domain and brand."""
@@ -6,18 +6,36 @@ Used by scan_email.py, imap_scanner.py, and other modules.
 """
 
 import re
+from html import unescape
 from typing import List, Set
 from urllib.parse import urlparse
 
-# URL pattern that matches most common URL formats
-URL_PATTERN = re.compile(
-    r'https?://[^\s<>"\')\]]+|www\.[^\s<>"\')\]]+',
-    re.IGNORECASE
+# google-re2 is optional: linear-time DFA matching for large email bodies
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Whitespace that Python's \s matches but RE2's ASCII-only \s does not
+# (NBSP, ideographic space, ...), spelled out so URLs end there either way
+UNICODE_SPACES = '\x0b\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000'
+
+# URL pattern that matches most common URL formats (inline flag, since
+# re2.compile takes options rather than re flags)
+URL_PATTERN = (re2 or re).compile(
+    r'(?i)https?://[^\s' + UNICODE_SPACES + r'<>"\')\]]+'
+    r'|www\.[^\s' + UNICODE_SPACES + r'<>"\')\]]+'
 )
 
 # Pattern for cleaning trailing punctuation
 TRAILING_PUNCT = re.compile(r'[.,;:!?)>\]]+$')
 
+# href attribute values: double-quoted, single-quoted or bare
+HREF_PATTERN = re.compile(
+    r'href\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s"\'>]+))',
+    re.IGNORECASE
+)
+
 
 def extract_urls_from_text(text: str) -> List[str]:
     """
@@ -62,15 +80,26 @@ def extract_urls_from_html(html: str) -> List[str]:
     
     urls = set()
     
-    # Extract from href attributes
-    href_pattern = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
-    for match in href_pattern.findall(html):
+    # Extract from href attributes. Entities are decoded per value, so an
+    # escaped quote ('&quot;', '&#39;') stays part of the URL
+    for groups in HREF_PATTERN.findall(html):
+        match = ''.join(groups)
+        if '&' in match:
+            match = unescape(match)
+        match = match.strip()
         if match.startswith(('http://', 'https://', 'www.')):
             urls.add(match if not match.startswith('www.') else 'https://' + match)
+        else:
+            # Relative hrefs can still carry a URL (redirect parameters)
+            urls.update(extract_urls_from_text(match))
     
-    # Also extract from plain text
-    text_urls = extract_urls_from_text(html)
-    urls.update(text_urls)
+    # Also extract from plain text. The href values handled above are
+    # blanked out first; the rest is decoded so '&amp;' queries and
+    # '&nbsp;' terminators read as they render
+    text = HREF_PATTERN.sub(' ', html)
+    if '&' in text:
+        text = unescape(text)
+    urls.update(extract_urls_from_text(text))
     
     return list(urls)
 
@@ -87,7 +116,7 @@ def is_valid_url(url: str) -> bool:
     """
     try:
         result = urlparse(url)
-        return all([result.scheme, result.netloc])
+        return bool(result.scheme and result.netloc)
     except Exception:
         return False
 
@@ -120,4 +149,5 @@ def normalize_url(url: str) -> str:
     if parsed.query:
         normalized += f"?{parsed.query}"
     
-    return normalized
+    # Hand back the caller's string when nothing changed
+    return url if normalized == url else normalized
@@ -15,19 +15,46 @@ Toolkit Detection Signatures:
 import os
 import time
 import asyncio
+import hashlib
 import re
 import json
 from urllib.parse import urlparse, parse_qs
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 from PIL import Image
 import io
 import logging
 from typing import Dict, List, Optional, Any, Set
 
+from url_extractor import UNICODE_SPACES
+
+# google-re2 is optional: scans a page for all of a toolkit's patterns at once
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# pyahocorasick is optional: finds every signature anchor in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on cached detect_toolkit() results
+TOOLKIT_CACHE_MAX_ENTRIES = 4096
+
+# Longest wait for dynamic content after DOMContentLoaded (milliseconds)
+DYNAMIC_CONTENT_WAIT_MS = 2000
+
+# Elements that mark a page as ready to capture (phishing pages are mostly a form)
+CONTENT_READY_SELECTOR = 'form, input[type="password"]'
+
+# Tags counted by WebScraper._extract_dom_features
+DOM_COUNTED_TAGS = ('form', 'input', 'a', 'img', 'script', 'iframe', 'meta')
+
 # Load TLD list for proper domain parsing
 _TLD_SET: Optional[Set[str]] = None
 
@@ -58,6 +85,11 @@ def _load_tld_set() -> Set[str]:
     return _TLD_SET
 
 
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a cached detect_toolkit() result so callers can't alter the cache."""
+    return dict(result, signatures_found=list(result['signatures_found']))
+
+
 class ToolkitSignatureDetector:
     """
     Detects signatures of common phishing toolkits.
@@ -167,9 +199,51 @@ class ToolkitSignatureDetector:
         ],
     }
     
+    # Literals (lower-case) every match of a page pattern contains. Without
+    # re2 a pattern is only searched when all of them occur on the page;
+    # a pattern missing here is always searched
+    _PATTERN_ANCHORS = {
+        r'var\s+rid\s*=': ('var', 'rid'),
+        r'gophish': ('gophish',),
+        r'campaign_id': ('campaign_id',),
+        r'rid=[a-zA-Z0-9]+': ('rid=',),
+        r'<input[^>]*name=["\']rid["\']': ('<input', 'name=', 'rid'),
+        r'<form[^>]*action=["\'][^"\']*\?rid=': ('<form', 'action=', '?rid='),
+        r'hiddeneye': ('hiddeneye',),
+        r'pish\.js': ('pish.js',),
+        r'<title>.*Login.*</title>': ('<title>', 'login', '</title>'),
+        r'class=["\']login-container["\']': ('class=', 'login-container'),
+        r'<meta[^>]*content=["\']hiddeneye': ('<meta', 'content=', 'hiddeneye'),
+        r'king_phisher': ('king_phisher',),
+        r'kp_track': ('kp_track',),
+        r'<!-- KingPhisher -->': ('<!-- kingphisher -->',),
+        r'king-phisher-tracking': ('king-phisher-tracking',),
+        r'socialfish': ('socialfish',),
+        r'sftrack': ('sftrack',),
+        r'<form[^>]*method=["\']post["\'][^>]*>.*?<input[^>]*type=["\']password':
+            ('<form', 'method=', 'post', '<input', 'type=', 'password'),
+        r'action=["\'][^"\']*login': ('action=', 'login'),
+        r'verify.*your.*account': ('verify', 'your', 'account'),
+        r'document\.forms\[0\]\.submit': ('document.forms[0].submit',),
+        r'btoa\(': ('btoa(',),
+        r'XMLHttpRequest.*password': ('xmlhttprequest', 'password'),
+    }
+    
+    # Page patterns per signature dict, each with the literals it requires,
+    # and the re2.Set over them when google-re2 is installed
+    # (see _compile_signatures)
+    _PAGE_PATTERNS: Dict[str, List[tuple]] = {}
+    _PAGE_SCANS: Dict[str, Any] = {}
+    _ANCHORS: frozenset = frozenset()
+    _ANCHOR_AUTOMATON = None
+    
+    # detect_toolkit() results keyed on (url, page digest, header names)
+    _cache: Dict[tuple, Dict[str, Any]] = {}
+    
     @classmethod
     def detect_toolkit(cls, url: str, html: str, headers: Dict[str, str] = None,
-                       soup: BeautifulSoup = None) -> Dict[str, Any]:
+                       soup: BeautifulSoup = None,
+                       use_cache: bool = True) -> Dict[str, Any]:
         """
         Detect phishing toolkit signatures in scraped content.
         
@@ -177,7 +251,9 @@ class ToolkitSignatureDetector:
             url: The URL being analyzed
             html: Raw HTML content
             headers: HTTP response headers
-            soup: BeautifulSoup parsed HTML
+            soup: BeautifulSoup parsed HTML (must be parsed from html)
+            use_cache: Reuse the result of an earlier detection on the
+                       same URL, page and header names
             
         Returns:
             Dictionary with detection results
@@ -193,23 +269,38 @@ class ToolkitSignatureDetector:
         if not html:
             return result
         
+        headers = headers or {}
+        cache_key = None
+        if use_cache:
+            digest = hashlib.blake2b(
+                html.encode('utf-8', 'surrogatepass'), digest_size=16
+            ).digest()
+            # Only header names are checked, case-insensitively
+            cache_key = (url, digest, frozenset(h.lower() for h in headers))
+            cached = cls._cache.get(cache_key)
+            if cached is not None:
+                return _copy_result(cached)
+        
         if soup is None:
             try:
                 soup = BeautifulSoup(html, 'lxml')
             except Exception:
                 soup = BeautifulSoup(html, 'html.parser')
         
-        headers = headers or {}
         parsed_url = urlparse(url)
         query_params = parse_qs(parsed_url.query)
         
+        # Without re2 each page pattern is its own regex search, so find the
+        # literals on the page once and skip patterns that cannot match
+        anchors = None if cls._PAGE_SCANS else cls._find_anchors(html)
+        
         # Check each toolkit
-        gophish_score, gophish_sigs = cls._check_gophish(url, html, headers, query_params, soup)
-        hiddeneye_score, hiddeneye_sigs = cls._check_hiddeneye(url, html, soup)
-        kingphisher_score, kingphisher_sigs = cls._check_king_phisher(url, html, headers, query_params)
-        socialfish_score, socialfish_sigs = cls._check_socialfish(url, html, soup)
+        gophish_score, gophish_sigs = cls._check_gophish(url, html, headers, query_params, soup, anchors)
+        hiddeneye_score, hiddeneye_sigs = cls._check_hiddeneye(url, html, soup, anchors)
+        kingphisher_score, kingphisher_sigs = cls._check_king_phisher(url, html, headers, query_params, anchors)
+        socialfish_score, socialfish_sigs = cls._check_socialfish(url, html, soup, anchors)
         evilginx_score, evilginx_sigs = cls._check_evilginx(url, html)
-        generic_score, generic_sigs = cls._check_generic_kit(url, html, soup)
+        generic_score, generic_sigs = cls._check_generic_kit(url, html, soup, anchors)
         
         # Determine the most likely toolkit
         scores = [
@@ -232,14 +323,81 @@ class ToolkitSignatureDetector:
             result['signatures_found'] = best_match[2]
             result['risk_multiplier'] = 1.5 if best_match[1] >= 0.6 else 1.2
         
+        if cache_key is not None:
+            if len(cls._cache) >= TOOLKIT_CACHE_MAX_ENTRIES:
+                cls._cache.clear()
+            cls._cache[cache_key] = _copy_result(result)
+        
         return result
     
+    @classmethod
+    def clear_cache(cls):
+        """Drop all cached detect_toolkit() results."""
+        cls._cache.clear()
+    
+    @classmethod
+    def _find_anchors(cls, html: str) -> Set[str]:
+        """
+        Find which signature anchor literals occur in the page.
+        
+        The page is case-folded the way the IGNORECASE patterns compare
+        it, so an anchor is never missed where its pattern would match.
+        
+        Args:
+            html: Raw HTML content
+            
+        Returns:
+            Set of the anchors present
+        """
+        if html.isascii():
+            folded = html.lower()
+        else:
+            # re's IGNORECASE equates both Turkish i's with 'i', casefold
+            # doesn't ('İ' folds to 'i' plus a combining dot)
+            folded = html.casefold().replace('i\u0307', 'i').replace('\u0131', 'i')
+        
+        if cls._ANCHOR_AUTOMATON is not None:
+            return {anchor for _, anchor in cls._ANCHOR_AUTOMATON.iter(folded)}
+        return {anchor for anchor in cls._ANCHORS if anchor in folded}
+    
+    @classmethod
+    def _scan_page(cls, name: str, html: str,
+                   anchors: Optional[Set[str]] = None) -> Set[re.Pattern]:
+        """
+        Find which html/js/meta patterns of a signature dict match the page.
+        
+        With google-re2 the page is scanned once for all of them; otherwise
+        each pattern is searched in turn, skipping those whose required
+        literals are missing from `anchors`.
+        
+        Args:
+            name: Name of a *_SIGNATURES dict
+            html: Raw HTML content
+            anchors: Anchors found by _find_anchors, or None to search
+                every pattern
+            
+        Returns:
+            Set of the compiled patterns that matched
+        """
+        page_patterns = cls._PAGE_PATTERNS.get(name, ())
+        search_set = cls._PAGE_SCANS.get(name)
+        if search_set is not None:
+            return {page_patterns[i][0] for i in search_set.Match(html) or ()}
+        
+        return {
+            pattern for pattern, required in page_patterns
+            if (anchors is None or anchors.issuperset(required))
+            and pattern.search(html)
+        }
+    
     @classmethod
     def _check_gophish(cls, url: str, html: str, headers: Dict, 
-                       query_params: Dict, soup: BeautifulSoup) -> tuple:
+                       query_params: Dict, soup: BeautifulSoup,
+                       anchors: Optional[Set[str]] = None) -> tuple:
         """Check for Gophish signatures."""
         score = 0.0
         signatures = []
+        matched = cls._scan_page('GOPHISH_SIGNATURES', html, anchors)
         
         # Check URL parameters (strongest indicator)
         for param in cls.GOPHISH_SIGNATURES['url_params']:
@@ -255,15 +413,15 @@ class ToolkitSignatureDetector:
         
         # Check HTML patterns
         for pattern in cls.GOPHISH_SIGNATURES['html_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.3
-                signatures.append(f"HTML pattern: {pattern[:30]}...")
+                signatures.append(f"HTML pattern: {pattern.pattern[:30]}...")
         
         # Check JS patterns
         for pattern in cls.GOPHISH_SIGNATURES['js_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.2
-                signatures.append(f"JavaScript: {pattern[:30]}...")
+                signatures.append(f"JavaScript: {pattern.pattern[:30]}...")
         
         # Check form structure (Gophish uses standard form with username/password)
         forms = soup.find_all('form')
@@ -278,43 +436,47 @@ class ToolkitSignatureDetector:
         return score, signatures
     
     @classmethod
-    def _check_hiddeneye(cls, url: str, html: str, soup: BeautifulSoup) -> tuple:
+    def _check_hiddeneye(cls, url: str, html: str, soup: BeautifulSoup,
+                         anchors: Optional[Set[str]] = None) -> tuple:
         """Check for HiddenEye signatures."""
         score = 0.0
         signatures = []
+        matched = cls._scan_page('HIDDENEYE_SIGNATURES', html, anchors)
         
         # Check URL patterns
         for pattern in cls.HIDDENEYE_SIGNATURES['url_patterns']:
-            if re.search(pattern, url, re.IGNORECASE):
+            if pattern.search(url):
                 score += 0.3
-                signatures.append(f"URL pattern: {pattern}")
+                signatures.append(f"URL pattern: {pattern.pattern}")
         
         # Check HTML patterns
         for pattern in cls.HIDDENEYE_SIGNATURES['html_patterns']:
-            if re.search(pattern, html, re.IGNORECASE | re.DOTALL):
+            if pattern in matched:
                 score += 0.3
                 signatures.append(f"HTML pattern detected")
         
         # Check meta patterns
         for pattern in cls.HIDDENEYE_SIGNATURES['meta_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.5
                 signatures.append("HiddenEye meta tag")
         
         # Check JS patterns
         for pattern in cls.HIDDENEYE_SIGNATURES['js_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.4
-                signatures.append(f"JavaScript: {pattern}")
+                signatures.append(f"JavaScript: {pattern.pattern}")
         
         return score, signatures
     
     @classmethod
     def _check_king_phisher(cls, url: str, html: str, headers: Dict, 
-                            query_params: Dict) -> tuple:
+                            query_params: Dict,
+                            anchors: Optional[Set[str]] = None) -> tuple:
         """Check for King Phisher signatures."""
         score = 0.0
         signatures = []
+        matched = cls._scan_page('KING_PHISHER_SIGNATURES', html, anchors)
         
         # Check URL parameters
         for param in cls.KING_PHISHER_SIGNATURES['url_params']:
@@ -330,35 +492,37 @@ class ToolkitSignatureDetector:
         
         # Check HTML patterns
         for pattern in cls.KING_PHISHER_SIGNATURES['html_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.5
                 signatures.append("King Phisher HTML comment")
         
         # Check JS patterns
         for pattern in cls.KING_PHISHER_SIGNATURES['js_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.3
-                signatures.append(f"JavaScript: {pattern}")
+                signatures.append(f"JavaScript: {pattern.pattern}")
         
         return score, signatures
     
     @classmethod
-    def _check_socialfish(cls, url: str, html: str, soup: BeautifulSoup) -> tuple:
+    def _check_socialfish(cls, url: str, html: str, soup: BeautifulSoup,
+                          anchors: Optional[Set[str]] = None) -> tuple:
         """Check for SocialFish signatures."""
         score = 0.0
         signatures = []
+        matched = cls._scan_page('SOCIALFISH_SIGNATURES', html, anchors)
         
         # Check URL patterns
         for pattern in cls.SOCIALFISH_SIGNATURES['url_patterns']:
-            if re.search(pattern, url, re.IGNORECASE):
+            if pattern.search(url):
                 score += 0.3
-                signatures.append(f"URL pattern: {pattern}")
+                signatures.append(f"URL pattern: {pattern.pattern}")
         
         # Check JS patterns
         for pattern in cls.SOCIALFISH_SIGNATURES['js_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.4
-                signatures.append(f"JavaScript: {pattern}")
+                signatures.append(f"JavaScript: {pattern.pattern}")
         
         # Check form fields
         forms = soup.find_all('form')
@@ -405,14 +569,14 @@ class ToolkitSignatureDetector:
         # Check redirect patterns (stronger indicator)
         redirect_matches = 0
         for pattern in cls.EVILGINX_SIGNATURES['redirect_patterns']:
-            if re.search(pattern, url, re.IGNORECASE):
+            if pattern.search(url):
                 redirect_matches += 1
                 score += 0.25
-                signatures.append(f"Redirect pattern: {pattern}")
+                signatures.append(f"Redirect pattern: {pattern.pattern}")
         
         # Check URL patterns - but only add score if combined with other indicators
         for pattern in cls.EVILGINX_SIGNATURES['url_patterns']:
-            if re.search(pattern, netloc, re.IGNORECASE):
+            if pattern.search(netloc):
                 # Only count if we have other indicators too
                 if redirect_matches > 0 or actual_subdomain_depth >= 3:
                     score += 0.15
@@ -480,30 +644,32 @@ class ToolkitSignatureDetector:
         return actual_subdomains
     
     @classmethod
-    def _check_generic_kit(cls, url: str, html: str, soup: BeautifulSoup) -> tuple:
+    def _check_generic_kit(cls, url: str, html: str, soup: BeautifulSoup,
+                           anchors: Optional[Set[str]] = None) -> tuple:
         """Check for generic phishing kit signatures."""
         score = 0.0
         signatures = []
+        matched = cls._scan_page('GENERIC_KIT_SIGNATURES', html, anchors)
         
         parsed = urlparse(url)
         
         # Check suspicious hosts
         for pattern in cls.GENERIC_KIT_SIGNATURES['suspicious_hosts']:
-            if re.search(pattern, parsed.netloc, re.IGNORECASE):
+            if pattern.search(parsed.netloc):
                 score += 0.3
-                signatures.append(f"Suspicious hosting: {pattern}")
+                signatures.append(f"Suspicious hosting: {pattern.pattern}")
         
         # Check HTML patterns
         for pattern in cls.GENERIC_KIT_SIGNATURES['html_patterns']:
-            if re.search(pattern, html, re.IGNORECASE | re.DOTALL):
+            if pattern in matched:
                 score += 0.15
-                signatures.append(f"HTML pattern: {pattern[:25]}...")
+                signatures.append(f"HTML pattern: {pattern.pattern[:25]}...")
         
         # Check JS patterns (credential harvesting)
         for pattern in cls.GENERIC_KIT_SIGNATURES['js_patterns']:
-            if re.search(pattern, html, re.IGNORECASE):
+            if pattern in matched:
                 score += 0.2
-                signatures.append(f"Suspicious JS: {pattern[:25]}...")
+                signatures.append(f"Suspicious JS: {pattern.pattern[:25]}...")
         
         # Check form fields
         forms = soup.find_all('form')
@@ -523,16 +689,151 @@ class ToolkitSignatureDetector:
         return score, signatures
 
 
+# Signature keys whose patterns are searched against the page HTML
+_PAGE_KEYS = ('html_patterns', 'js_patterns', 'meta_patterns')
+
+# Dotted capital and dotless small i: re's IGNORECASE equates them with
+# 'i', RE2's doesn't
+_TURKISH_IS = '\u0130\u0131'
+
+
+def _re2_class(source: str, start: int) -> tuple:
+    """
+    Rewrite the character class opening at source[start] for RE2.
+
+    Returns:
+        Tuple of (rewritten class, index just past its closing ']')
+    """
+    out = ['[']
+    i = start + 1
+    if source.startswith('^', i):
+        out.append('^')
+        i += 1
+    covers_i = False
+    first = True
+    # A ']' right after '[' or '[^' is a literal, not the class end
+    while i < len(source) and (source[i] != ']' or first):
+        first = False
+        if source[i] == '\\' and i + 1 < len(source):
+            escape = source[i:i + 2]
+            out.append(UNICODE_SPACES + '\\s' if escape == '\\s' else escape)
+            i += 2
+            continue
+        is_range = source.startswith('-', i + 1) and source[i + 2:i + 3] not in ('', ']')
+        end = i + 3 if is_range else i + 1
+        low, high = source[i], source[end - 1]
+        covers_i = covers_i or low <= 'i' <= high or low <= 'I' <= high
+        out.append(source[i:end])
+        i = end
+    if covers_i:
+        out.append(_TURKISH_IS)
+    out.append(']')
+    return ''.join(out), i + 1
+
+
+def _re2_pattern(pattern: re.Pattern) -> str:
+    """
+    Rewrite a compiled pattern for re2.Set so it matches what re matches.
+
+    Flags become inline flags. Each \\s gains the Unicode spaces that
+    Python's \\s covers (NBSP, ideographic space, ...) but RE2's doesn't,
+    and each i (literal or in a class) gains the Turkish i's that re's
+    IGNORECASE treats as the same letter. Python's Unicode \\w, \\d and
+    \\b would need the same treatment; no signature uses them.
+    """
+    out = ['(?is)' if pattern.flags & re.DOTALL else '(?i)']
+    source = pattern.pattern
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == '\\' and i + 1 < len(source):
+            escape = source[i:i + 2]
+            out.append('[' + UNICODE_SPACES + '\\s]' if escape == '\\s' else escape)
+            i += 2
+        elif char == '[':
+            rewritten, i = _re2_class(source, i)
+            out.append(rewritten)
+        elif source.startswith('(?', i):
+            # Group syntax ('(?:', '(?P<name>', inline flags) is copied as is
+            end = i + 2
+            if source.startswith('P<', end):
+                end = source.index('>', end)
+            else:
+                while end < len(source) and (source[end].isalpha() or source[end] == '-'):
+                    end += 1
+            out.append(source[i:end + 1])
+            i = end + 1
+        else:
+            out.append('[i' + _TURKISH_IS + ']' if char in 'iI' else char)
+            i += 1
+    return ''.join(out)
+
+
+def _compile_signatures(name: str, dotall: tuple = ()) -> None:
+    """
+    Replace the pattern strings of a signature dict with compiled patterns.
+
+    The flags each _check_* method searched with are baked in here, so the
+    checks call pattern.search() directly and read pattern.pattern for labels.
+    The patterns searched against the page are also registered for
+    ToolkitSignatureDetector._scan_page, gathered into one re2.Set when
+    google-re2 is installed.
+
+    Args:
+        name: Name of a ToolkitSignatureDetector *_SIGNATURES dict
+        dotall: Keys whose patterns were searched with re.DOTALL
+    """
+    signatures = getattr(ToolkitSignatureDetector, name)
+    for key, values in signatures.items():
+        if key.endswith('_patterns') or key == 'suspicious_hosts':
+            flags = re.IGNORECASE | (re.DOTALL if key in dotall else 0)
+            signatures[key] = [re.compile(p, flags) for p in values]
+
+    page_patterns = [
+        (p, ToolkitSignatureDetector._PATTERN_ANCHORS.get(p.pattern, ()))
+        for key in _PAGE_KEYS for p in signatures.get(key, ())
+    ]
+    ToolkitSignatureDetector._PAGE_PATTERNS[name] = page_patterns
+    ToolkitSignatureDetector._ANCHORS |= {
+        anchor for _, required in page_patterns for anchor in required
+    }
+    if re2 is None or not page_patterns:
+        return
+
+    search_set = re2.Set.SearchSet(re2.Options())
+    for pattern, _ in page_patterns:
+        search_set.Add(_re2_pattern(pattern))
+    search_set.Compile()
+    ToolkitSignatureDetector._PAGE_SCANS[name] = search_set
+
+
+_compile_signatures('GOPHISH_SIGNATURES')
+_compile_signatures('HIDDENEYE_SIGNATURES', dotall=('html_patterns',))
+_compile_signatures('KING_PHISHER_SIGNATURES')
+_compile_signatures('SOCIALFISH_SIGNATURES')
+_compile_signatures('EVILGINX_SIGNATURES')
+_compile_signatures('GENERIC_KIT_SIGNATURES', dotall=('html_patterns',))
+
+if ahocorasick is not None and ToolkitSignatureDetector._ANCHORS:
+    ToolkitSignatureDetector._ANCHOR_AUTOMATON = ahocorasick.Automaton()
+    for _anchor in ToolkitSignatureDetector._ANCHORS:
+        ToolkitSignatureDetector._ANCHOR_AUTOMATON.add_word(_anchor, _anchor)
+    ToolkitSignatureDetector._ANCHOR_AUTOMATON.make_automaton()
+
+
 class WebScraper:
     """Scrapes screenshots, HTML, and DOM structure from URLs using Playwright (Async)"""
     
-    def __init__(self, headless=True, timeout=30000):
+    def __init__(self, headless=True, timeout=30000, pool_size=5):
         self.timeout = timeout  # Playwright uses milliseconds
         self.headless = headless
+        self.pool_size = pool_size  # Pages kept open for reuse across scrapes
         self.playwright = None
         self.browser = None
         self.context = None
         self.response_headers = {}
+        self._page_pool = None
+        self._pages_open = 0  # Pooled pages, idle or in use
     
     async def _init_browser(self):
         """Initialize Playwright browser"""
@@ -549,6 +850,97 @@ class WebScraper:
                 }
             )
             
+            # Pre-open the pages scrape_url() takes turns on
+            self._page_pool = asyncio.Queue()
+            for _ in range(self.pool_size):
+                self._page_pool.put_nowait(await self.context.new_page())
+                self._pages_open += 1
+    
+    async def _acquire_page(self):
+        """
+        Take a page from the pool, opening a new one if pages were lost.
+        
+        Raises if no page can be opened or none frees up within the
+        scraper timeout, so a broken browser fails scrapes instead of
+        blocking them.
+        """
+        if self._page_pool.empty() and self._pages_open < self.pool_size:
+            self._pages_open += 1
+            try:
+                return await self.context.new_page()
+            except Exception:
+                self._pages_open -= 1
+                raise
+        
+        try:
+            return await asyncio.wait_for(self._page_pool.get(), self.timeout / 1000)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"No pooled page free after {self.timeout} ms")
+    
+    async def _release_page(self, page, reuse: bool):
+        """Reset a page and return it to the pool, replacing it if unusable."""
+        if self._page_pool is None:
+            return  # close() ran while the page was in use
+        
+        if reuse:
+            try:
+                await page.goto('about:blank')
+            except Exception:
+                reuse = False
+        
+        if not reuse:
+            try:
+                await page.close()
+            except Exception:
+                pass
+            try:
+                page = await self.context.new_page()
+            except Exception as e:
+                # _acquire_page opens a new page on demand later
+                logger.error(f"Could not replace pooled page: {str(e)}")
+                self._pages_open -= 1
+                return
+        
+        self._page_pool.put_nowait(page)
+    
+    async def _wait_for_content(self, page):
+        """
+        Wait for the page to load, then until the network is idle or a form
+        shows up, whichever comes first, for at most DYNAMIC_CONTENT_WAIT_MS
+        in total.
+        
+        The load event comes first so logos, stylesheets and fonts have
+        painted before the screenshot, even on static pages whose form is
+        already there at DOMContentLoaded. The form check then only cuts
+        short the wait for late network activity.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + DYNAMIC_CONTENT_WAIT_MS / 1000
+        
+        try:
+            await page.wait_for_load_state('load', timeout=DYNAMIC_CONTENT_WAIT_MS)
+        except Exception:
+            return  # Out of time (or the page went away)
+        
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return
+        
+        waits = [
+            asyncio.ensure_future(page.wait_for_load_state(
+                'networkidle', timeout=remaining * 1000
+            )),
+            asyncio.ensure_future(page.wait_for_selector(
+                CONTENT_READY_SELECTOR, state='attached', timeout=remaining * 1000
+            )),
+        ]
+        _, pending = await asyncio.wait(
+            waits, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*waits, return_exceptions=True)
+    
     async def scrape_url(self, url: str) -> Dict[str, Any]:
         """
         Scrape all modalities from a URL including toolkit detection.
@@ -584,9 +976,6 @@ class WebScraper:
             if not url.startswith(('http://', 'https://')):
                 url = 'http://' + url
             
-            # Create new page
-            page = await self.context.new_page()
-            
             # Capture response headers
             response_headers = {}
             
@@ -595,6 +984,8 @@ class WebScraper:
                     for key, value in response.headers.items():
                         response_headers[key] = value
             
+            # Take a page from the pool (waits while all are in use)
+            page = await self._acquire_page()
             page.on('response', capture_response)
             
             # Navigate to URL (Wait for DOMContentLoaded instead of NetworkIdle to prevent timeouts)
@@ -608,7 +999,7 @@ class WebScraper:
             result['response_headers'] = response_headers
             
             # Wait a bit for dynamic content
-            await page.wait_for_timeout(2000)
+            await self._wait_for_content(page)
             
             # Get screenshot
             screenshot_bytes = await page.screenshot(full_page=False)
@@ -648,14 +1039,59 @@ class WebScraper:
         
         finally:
             if page:
-                await page.close()
+                page.remove_listener('response', capture_response)
+                # Pages that failed (e.g. navigation errors) are replaced
+                await self._release_page(page, reuse=result['success'])
         
         return result
     
+    async def scrape_urls(self, urls: List[str], max_concurrency: int = 5) -> List[Any]:
+        """
+        Scrape many URLs concurrently in the shared browser context.
+        
+        Args:
+            urls: URLs to scrape
+            max_concurrency: Maximum number of pages loading at once
+                             (also bounded by pool_size)
+        
+        Returns:
+            One scrape_url() result per URL, in order (or the exception
+            raised while scraping it)
+        """
+        # Start the browser once up front, not from every coroutine
+        await self._init_browser()
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def scrape_one(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.scrape_url(url)
+        
+        return await asyncio.gather(
+            *(scrape_one(url) for url in urls), return_exceptions=True
+        )
+    
     def _extract_dom_features(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """Extract structural features from DOM"""
+        # Count tags, collect forms and find the title in one walk of the tree
+        counts = dict.fromkeys(DOM_COUNTED_TAGS, 0)
+        forms = []
+        title = None
+        has_login_form = False
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            name = element.name
+            if name in counts:
+                counts[name] += 1
+                if name == 'form':
+                    forms.append(element)
+                elif name == 'input' and element.get('type') == 'password':
+                    has_login_form = True
+            elif name == 'title' and title is None:
+                title = element
+        
         # Extract form details for toolkit detection
-        forms = soup.find_all('form')
         form_details = []
         for form in forms:
             inputs = form.find_all('input')
@@ -668,26 +1104,39 @@ class WebScraper:
             form_details.append(form_info)
         
         return {
-            'num_forms': len(soup.find_all('form')),
-            'num_inputs': len(soup.find_all('input')),
-            'num_links': len(soup.find_all('a')),
-            'num_images': len(soup.find_all('img')),
-            'num_scripts': len(soup.find_all('script')),
-            'num_iframes': len(soup.find_all('iframe')),
-            'has_login_form': bool(soup.find('input', {'type': 'password'})),
-            'title': soup.title.string if soup.title else "",
-            'meta_tags': len(soup.find_all('meta')),
+            'num_forms': counts['form'],
+            'num_inputs': counts['input'],
+            'num_links': counts['a'],
+            'num_images': counts['img'],
+            'num_scripts': counts['script'],
+            'num_iframes': counts['iframe'],
+            'has_login_form': has_login_form,
+            'title': title.string if title else "",
+            'meta_tags': counts['meta'],
             'form_details': form_details,  # Added for toolkit detection
         }
     
     async def close(self):
-        """Close the browser"""
+        """Close the pooled pages and the browser"""
+        if self._page_pool is not None:
+            while not self._page_pool.empty():
+                try:
+                    await self._page_pool.get_nowait().close()
+                except Exception:
+                    pass
         if self.context:
             await self.context.close()
         if self.browser:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        
+        # Reset so a later _init_browser() starts a fresh browser and pool
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self._page_pool = None
+        self._pages_open = 0
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -101,6 +101,100 @@ class TestTLSSecurityAnalyzer:
         for key in required_keys:
             assert key in features, f"Missing key: {key}"
 
+    def test_analysis_cache(self):
+        """Test repeated analyses are served from the cache as copies"""
+        from tls_analyzer import TLSSecurityAnalyzer, clear_tls_cache
+
+        clear_tls_cache()
+        analyzer = TLSSecurityAnalyzer(timeout=1)
+
+        # Unresolvable host fails fast and is negatively cached
+        first = analyzer.analyze("nonexistent.invalid")
+        first['warnings'].append("mutated")
+        second = analyzer.analyze("nonexistent.invalid")
+
+        assert second['error'] is not None
+        assert "mutated" not in second['warnings']
+        clear_tls_cache()
+
+    def test_cache_respects_instance_ttl(self):
+        """Test cache_ttl=0 never serves results cached by other analyzers"""
+        from tls_analyzer import TLSSecurityAnalyzer, clear_tls_cache
+
+        def stub_analyze(hostname, port):
+            calls.append(hostname)
+            return {'error': None, 'certificate': {'valid': True},
+                    'ct_timed_out': False, 'warnings': []}
+
+        clear_tls_cache()
+        calls = []
+        caching = TLSSecurityAnalyzer(cache_ttl=600)
+        uncached = TLSSecurityAnalyzer(cache_ttl=0)
+        caching._analyze = uncached._analyze = stub_analyze
+
+        caching.analyze("ttl.example")
+        caching.analyze("ttl.example")
+        assert len(calls) == 1
+
+        uncached.analyze("ttl.example")
+        uncached.analyze("ttl.example")
+        assert len(calls) == 3
+        clear_tls_cache()
+
+    def test_ct_timeout_cached_briefly(self):
+        """Test a timed-out CT lookup is flagged and only negatively cached"""
+        import time
+        import tls_analyzer
+        from tls_analyzer import TLSSecurityAnalyzer, clear_tls_cache
+
+        clear_tls_cache()
+        analyzer = TLSSecurityAnalyzer(timeout=0.1, cache_ttl=600, negative_ttl=5)
+        analyzer._get_tls_info = lambda host, port: {
+            'tls_version': 'TLSv1.3', 'tls_score': 40,
+            'certificate': {'valid': True, 'expires_in_days': 90, 'issuer': None,
+                            'subject': None, 'serial_number': None},
+        }
+        analyzer._check_security_headers = lambda host, port: {}
+        analyzer._check_certificate_transparency = lambda host: time.sleep(0.5) or {'ct_logs_found': True}
+
+        results = analyzer.analyze("ct-timeout.example")
+
+        assert results['ct_timed_out'] and not results['ct_logs_found']
+        _, expires = tls_analyzer._analysis_cache[("ct-timeout.example", 443, 600, 5)]
+        assert expires - time.monotonic() <= 5
+        clear_tls_cache()
+
+    def test_header_probe_has_deadline(self):
+        """Test a hung header probe can't hold up the analysis"""
+        import time
+        from tls_analyzer import TLSSecurityAnalyzer
+
+        analyzer = TLSSecurityAnalyzer(timeout=0.1, cache_ttl=0, negative_ttl=0)
+        analyzer._get_tls_info = lambda host, port: {
+            'tls_version': 'TLSv1.3', 'tls_score': 100,
+            'certificate': {'valid': True, 'expires_in_days': 90, 'issuer': None,
+                            'subject': None, 'serial_number': None},
+        }
+        analyzer._check_security_headers = lambda host, port: time.sleep(2) or {'hsts_enabled': True}
+        analyzer._check_certificate_transparency = lambda host: {'ct_logs_found': True}
+
+        start = time.monotonic()
+        results = analyzer.analyze("slow-headers.example")
+
+        assert time.monotonic() - start < 1
+        assert not results['hsts_enabled'] and results['ct_logs_found']
+        assert "Security header check timed out" in results['warnings']
+
+    def test_batch_feature_extraction(self):
+        """Test batch extraction matches single calls and keeps order"""
+        from tls_analyzer import extract_tls_features, extract_tls_features_batch
+
+        urls = ["http://example.com", "ftp://example.org", "http://example.com"]
+        features = extract_tls_features_batch(urls)
+
+        assert features == [extract_tls_features(url) for url in urls]
+        assert features[0] is not features[2]
+
 
 class TestSecurityValidator:
     """Test URL security validation"""
@@ -170,6 +264,458 @@ class TestSecurityValidator:
             is_valid, errors = validator.validate(url)
             assert is_valid, f"Should allow {url}, got errors: {errors}"
 
+    def test_validate_and_canonicalize(self):
+        """Test combined validation + canonicalization matches separate calls"""
+        from security_validator import URLSecurityValidator
+
+        validator = URLSecurityValidator()
+
+        url = "HTTPS://Example.COM:443/path?b=2&a=1"
+        is_valid, errors, canonical = validator.validate_and_canonicalize(url)
+
+        assert (is_valid, errors) == validator.validate(url)
+        assert canonical == validator.canonicalize(url)
+        assert canonical == "https://example.com/path?a=1&b=2"
+
+    def test_validate_url_for_analysis_canonicalize(self):
+        """Test the API entry point can hand back the canonical URL"""
+        from security_validator import validate_url_for_analysis
+
+        url = "HTTPS://Example.COM:443/path?b=2&a=1"
+        assert validate_url_for_analysis(url) == (True, "")
+        assert validate_url_for_analysis(url, canonicalize=True) == (
+            True, "", "https://example.com/path?a=1&b=2"
+        )
+
+        is_valid, error, canonical = validate_url_for_analysis("file:///etc/passwd", canonicalize=True)
+        assert not is_valid and "file" in error
+
+
+class TestTyposquatting:
+    """Test typosquatting / brand impersonation detection"""
+
+    def test_brand_similarity(self):
+        """Test near-miss brand domains are flagged by similarity"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        for url, brand in [("https://paypa1.com", "paypal"),
+                           ("https://arnazon.com", "amazon"),
+                           ("https://twltter.com", "twitter")]:
+            result = detector.analyze(url)
+            assert result['is_typosquatting'], f"Should flag {url}"
+            assert result['impersonated_brand'] == brand
+            assert result['detection_method'] == 'levenshtein_similarity'
+
+    def test_legitimate_domains(self):
+        """Test legitimate brand domains are not flagged"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        for url in ["https://google.com", "https://login.paypal.com",
+                    "https://mail.google.com", "https://aliexpress.com",
+                    "https://icicibank.com"]:
+            result = detector.analyze(url)
+            assert not result['is_typosquatting'], f"Should allow {url}"
+
+    def test_brand_and_tld_attacks(self):
+        """Test brand-in-domain, subdomain and faulty TLD detection"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        assert detector.analyze("https://secure-paypal-login.xyz")['detection_method'] == 'brand_in_domain'
+        assert detector.analyze("https://secure-paypal.com")['detection_method'] == 'brand_in_domain'
+        assert detector.analyze("https://paypal.login.xyz")['detection_method'] == 'subdomain_attack'
+        assert detector.analyze("https://blinkit.pom")['detection_method'] == 'faulty_extension'
+
+    def test_unicode_homoglyphs(self):
+        """Test Cyrillic and fullwidth lookalikes are normalized to the brand"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        for url in ["https://secure-p\u0430yp\u0430l.com",
+                    "https://\uff50\uff41\uff59\uff50\uff41\uff4c-secure.com"]:
+            result = detector.analyze(url)
+            assert result['impersonated_brand'] == 'paypal', f"Should flag {url}"
+            assert result['detection_method'] == 'homoglyph_substitution'
+
+    def test_analysis_cache(self):
+        """Test repeated URLs are served from the cache without sharing state"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        first = detector.analyze("https://paypa1.com")
+        first['details'].append("modified by caller")
+        second = detector.analyze("https://paypa1.com")
+        assert second == detector.analyze("https://paypa1.com", use_cache=False)
+        assert "modified by caller" not in second['details']
+
+        detector.clear_cache()
+        assert not detector._cache
+
+    def test_batch_analysis(self):
+        """Test batch analysis matches single calls and keeps order"""
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        urls = ["https://paypa1.com", "https://google.com",
+                "https://blinkit.pom", "https://paypa1.com"]
+        results = detector.analyze_batch(urls, use_cache=False)
+
+        assert results == [detector.analyze(url, use_cache=False) for url in urls]
+        assert results[0] is not results[3]
+
+    def test_similarity_matches_difflib(self):
+        """Test scores are SequenceMatcher ratios whether or not rapidfuzz is installed"""
+        from difflib import SequenceMatcher
+        from typosquatting_detector import TyposquattingDetector
+
+        detector = TyposquattingDetector()
+
+        domains = ["palpa", "paypa1", "arnazon", "gooogle"]
+        expected = []
+        for domain in domains:
+            scores = {brand: SequenceMatcher(None, domain, brand).ratio()
+                      for brand in detector._brand_list}
+            expected.append({brand: score for brand, score in scores.items() if score >= 0.7})
+
+        assert [detector._brand_similarities(d) for d in domains] == expected
+        assert detector._batch_similarities(domains) in ([None] * len(domains), expected)
+        assert "paypal" not in expected[0]
+
+
+class TestURLExtractor:
+    """Test URL extraction from email text and HTML"""
+
+    def test_unicode_space_terminators(self):
+        """Test URLs end at non-ASCII whitespace with either regex engine"""
+        from url_extractor import extract_urls_from_text
+
+        for text in ["Go to https://paypal.example/verify today",
+                     "Go to https://paypal.example/verify　today"]:
+            assert extract_urls_from_text(text) == ["https://paypal.example/verify"]
+
+    def test_html_hrefs_and_entities(self):
+        """Test bare and spaced hrefs, '&amp;' queries and '&nbsp;' terminators"""
+        from url_extractor import extract_urls_from_html
+
+        html = ('<a href=https://evil.example/login>Sign in</a>'
+                '<a href = "https://evil.example/a?x=1&amp;y=2">Verify</a>'
+                '<p>https://paypal.example/verify&nbsp;today</p>')
+
+        assert sorted(extract_urls_from_html(html)) == [
+            "https://evil.example/a?x=1&y=2",
+            "https://evil.example/login",
+            "https://paypal.example/verify",
+        ]
+
+    def test_escaped_quotes_inside_hrefs(self):
+        """Test entity-escaped quotes stay inside quoted href values"""
+        from url_extractor import extract_urls_from_html
+
+        html = '<a href="https://x.com/?q=&quot;a&quot;&amp;b=1">x</a>'
+        assert extract_urls_from_html(html) == ['https://x.com/?q="a"&b=1']
+
+        html = "<a href='https://x.com/it&#39;s'>x</a>"
+        assert extract_urls_from_html(html) == ["https://x.com/it's"]
+
+
+class TestTextFeatureGenerator:
+    """Test batched MLLM text feature generation (stub transformer)"""
+
+    @staticmethod
+    def _generator(data_dir, transformer):
+        from text_feature_generator import TextFeatureGenerator
+
+        # Bypass __init__, which loads the real MLLM
+        generator = TextFeatureGenerator.__new__(TextFeatureGenerator)
+        generator.data_dir = data_dir
+        generator.output_dir = data_dir.parent / "mllm_features"
+        generator.output_dir.mkdir()
+        generator.transformer = transformer
+        return generator
+
+    def test_batch_failure_falls_back_per_item(self):
+        """Test one bad input in a batch only loses its own file"""
+        import json
+        import tempfile
+        from pathlib import Path
+
+        class StubTransformer:
+            def transform_to_text(self, metadata):
+                if metadata['url'] == 'bad':
+                    raise ValueError("bad input")
+                return f"desc {metadata['idx']}"
+
+            def transform_to_text_batch(self, metadata_list):
+                return [self.transform_to_text(m) for m in metadata_list]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp) / "metadata"
+            data_dir.mkdir()
+            for idx in range(5):
+                metadata = {'idx': idx, 'url': 'bad' if idx == 2 else f'https://{idx}.example', 'label': 0}
+                (data_dir / f"{idx}.json").write_text(json.dumps(metadata))
+
+            generator = self._generator(data_dir, StubTransformer())
+            results = generator.generate_features(batch_size=4)
+
+            assert sorted(r['idx'] for r in results) == [0, 1, 3, 4]
+            written = sorted(p.name for p in generator.output_dir.iterdir())
+            assert written == ["0_mllm.json", "1_mllm.json", "3_mllm.json", "4_mllm.json"]
+            saved = json.loads((generator.output_dir / "3_mllm.json").read_text())
+            assert saved['text_description'] == "desc 3"
+
+            # Finished outputs are skipped on the next run
+            assert generator.generate_features(batch_size=4) == []
+
+    def test_finished_writes_are_dropped(self):
+        """Test write futures are released as they complete"""
+        from concurrent.futures import Future
+        from text_feature_generator import TextFeatureGenerator
+
+        done, pending = Future(), Future()
+        done.set_result(None)
+        writes = {done: "a", pending: "b"}
+
+        TextFeatureGenerator._reap_writes(writes)
+        assert writes == {pending: "b"}
+
+        pending.set_exception(OSError("disk full"))
+        TextFeatureGenerator._reap_writes(writes, wait=True)
+        assert writes == {}
+
+
+class TestToolkitSignatureDetector:
+    """Test phishing toolkit page-pattern matching"""
+
+    PAGES = [
+        '<script>var rid = 5; gophish.track()</script>',
+        '<script>var\u00a0rid\u3000= 7</script>',
+        '<form action="/x?rid=1"><input type="hidden" name=\'rid\'></form>',
+        '<title>Please\nLOGİN now</title><div class="login-container"></div>',
+        "<meta name=x content='HiddenEye kit'><script src=pish.js></script>",
+        '<!-- KingPhisher --><div class=king-phisher-tracking>KP_TRACK</div>',
+        '<script>socialfish(); sftrack()</script>',
+        '<form method="post"><input name="user"><input type="password"></form>',
+        '<form action="/secure/login.php"></form><p>Verify your Account</p>',
+        '<script>document.forms[0].submit(); btoa(x); new XMLHttpRequest(); password</script>',
+        '<p>Nothing to see here</p>',
+    ]
+
+    def test_anchor_prefilter_keeps_matches(self):
+        """Test every matching pattern's anchors are found on the page"""
+        pytest.importorskip("playwright.async_api")
+        from web_scraper import ToolkitSignatureDetector
+
+        for html in self.PAGES:
+            anchors = ToolkitSignatureDetector._find_anchors(html)
+            for name, page_patterns in ToolkitSignatureDetector._PAGE_PATTERNS.items():
+                for pattern, required in page_patterns:
+                    if pattern.search(html):
+                        assert anchors.issuperset(required), (name, pattern.pattern)
+
+    def test_re2_set_matches_re(self):
+        """Test the re2.Set scan finds the same patterns as re"""
+        pytest.importorskip("playwright.async_api")
+        pytest.importorskip("re2")
+        from web_scraper import ToolkitSignatureDetector
+
+        for html in self.PAGES:
+            for name, page_patterns in ToolkitSignatureDetector._PAGE_PATTERNS.items():
+                expected = {pattern for pattern, _ in page_patterns if pattern.search(html)}
+                assert ToolkitSignatureDetector._scan_page(name, html) == expected, (name, html)
+
+
+class TestWebScraper:
+    """Test the scraper's browser and page pool lifecycle (stub Playwright)"""
+
+    def test_close_resets_page_pool(self):
+        """Test close() closes pooled pages and allows a fresh start"""
+        import asyncio
+        pytest.importorskip("playwright.async_api")
+        import web_scraper
+
+        class StubPage:
+            closed = False
+
+            async def close(self):
+                self.closed = True
+
+        class StubContext:
+            def __init__(self):
+                self.pages = []
+
+            async def new_page(self):
+                self.pages.append(StubPage())
+                return self.pages[-1]
+
+            async def close(self):
+                pass
+
+        class StubBrowser:
+            async def new_context(self, **kwargs):
+                return StubContext()
+
+            async def close(self):
+                pass
+
+        class StubPlaywright:
+            class chromium:
+                @staticmethod
+                async def launch(headless=True):
+                    return StubBrowser()
+
+            async def start(self):
+                return self
+
+            async def stop(self):
+                pass
+
+        async def lifecycle():
+            scraper = web_scraper.WebScraper(pool_size=2)
+            await scraper._init_browser()
+            first_context = scraper.context
+            await scraper.close()
+
+            assert all(page.closed for page in first_context.pages)
+            assert scraper.playwright is None and scraper._page_pool is None
+            assert scraper._pages_open == 0
+
+            await scraper._init_browser()
+            assert scraper.context is not first_context
+            assert scraper._pages_open == 2 and scraper._page_pool.qsize() == 2
+            page = await scraper._acquire_page()
+            assert page in scraper.context.pages
+            await scraper.close()
+
+        original = web_scraper.async_playwright
+        web_scraper.async_playwright = StubPlaywright
+        try:
+            asyncio.run(lifecycle())
+        finally:
+            web_scraper.async_playwright = original
+
+
+class TestSecureConfig:
+    """Test encrypted config storage (AES-GCM format, legacy Fernet reads)"""
+
+    @staticmethod
+    def _manager(home):
+        from cryptography.fernet import Fernet
+        from secure_config import SecureConfigManager
+
+        previous = os.environ.get('HOME')
+        os.environ['HOME'] = home
+        try:
+            manager = SecureConfigManager(app_name="phishing_guard_test")
+        finally:
+            if previous is None:
+                del os.environ['HOME']
+            else:
+                os.environ['HOME'] = previous
+        # Pre-load a key so the tests never touch the system keyring
+        manager._key = Fernet.generate_key()
+        return manager
+
+    def test_aesgcm_round_trip(self):
+        """Test configs are written as version || nonce || ciphertext and read back"""
+        import stat
+        import tempfile
+        pytest.importorskip("cryptography")
+
+        config = {"email": "user@example.com", "password": "s3cret", "port": 993}
+        with tempfile.TemporaryDirectory() as home:
+            manager = self._manager(home)
+            manager.encrypt_config(config)
+
+            data = manager.config_file.read_bytes()
+            assert data[:1] == b'\x02'
+            assert b"s3cret" not in data
+            assert stat.S_IMODE(manager.config_file.stat().st_mode) == 0o600
+            assert manager.decrypt_config() == config
+
+            # Same key, fresh instance (no cached ciphers)
+            reader = self._manager(home)
+            reader._key = manager._key
+            assert reader.get_config("password") == "s3cret"
+
+            manager.update_config({"password": "n3w"})
+            assert manager.get_config("password") == "n3w"
+            assert [p.name for p in manager.config_dir.iterdir()] == ["config.enc"]
+
+    def test_reads_legacy_fernet_config(self):
+        """Test Fernet configs from earlier versions (base64 text and raw bytes)"""
+        import base64
+        import json
+        import tempfile
+        pytest.importorskip("cryptography")
+        from cryptography.fernet import Fernet
+
+        config = {"email": "user@example.com", "password": "legacy"}
+        with tempfile.TemporaryDirectory() as home:
+            manager = self._manager(home)
+            token = Fernet(manager._key).encrypt(json.dumps(config, indent=2).encode('utf-8'))
+
+            for data in (token, base64.urlsafe_b64decode(token)):
+                manager.config_file.write_bytes(data)
+                assert manager.decrypt_config() == config
+
+            # Rewriting a legacy config moves it to the current format
+            manager.update_config({"password": "upgraded"})
+            assert manager.config_file.read_bytes()[:1] == b'\x02'
+            assert manager.get_config("password") == "upgraded"
+
+    def test_failed_write_keeps_old_config(self):
+        """Test an interrupted write leaves the previous config and no temp file"""
+        import tempfile
+        pytest.importorskip("cryptography")
+        import secure_config
+
+        with tempfile.TemporaryDirectory() as home:
+            manager = self._manager(home)
+            manager.encrypt_config({"password": "old"})
+
+            def failing_replace(src, dst):
+                raise OSError("disk full")
+
+            original = secure_config.os.replace
+            secure_config.os.replace = failing_replace
+            try:
+                with pytest.raises(OSError):
+                    manager.encrypt_config({"password": "new"})
+            finally:
+                secure_config.os.replace = original
+
+            assert manager.get_config("password") == "old"
+            assert [p.name for p in manager.config_dir.iterdir()] == ["config.enc"]
+
+    def test_secure_delete_overwrites_contents(self):
+        """Test _secure_delete zeroes the file's data before unlinking it"""
+        import tempfile
+        from pathlib import Path
+        pytest.importorskip("cryptography")
+
+        with tempfile.TemporaryDirectory() as home:
+            manager = self._manager(home)
+            target = Path(home) / "email_config.json"
+            target.write_bytes(b'{"password": "plaintext"}' * 100000)
+            size = target.stat().st_size
+            # A second link to the same inode shows what was left on disk
+            witness = Path(home) / "witness"
+            os.link(target, witness)
+
+            manager._secure_delete(target)
+
+            assert not target.exists()
+            assert witness.read_bytes() == bytes(size)
+
 
 class TestEnhancedFeatures:
     """Test enhanced feature extraction (93 features)"""
@@ -332,6 +878,12 @@ def run_all_tests():
         TestIDNDetection,
         TestTLSSecurityAnalyzer,
         TestSecurityValidator,
+        TestTyposquatting,
+        TestURLExtractor,
+        TestTextFeatureGenerator,
+        TestToolkitSignatureDetector,
+        TestWebScraper,
+        TestSecureConfig,
         TestEnhancedFeatures,
         TestAuthentication,
         TestRateLimiting,
@@ -354,6 +906,8 @@ def run_all_tests():
                 method()
                 print(f"  ✓ {method_name}")
                 passed += 1
+            except pytest.skip.Exception as e:
+                print(f"  - {method_name}: skipped ({str(e)[:70]})")
             except Exception as e:
                 print(f"  ✗ {method_name}: {str(e)[:80]}")
                 failed += 1